@@ -29,6 +29,7 @@ from src.tools.github_trending import GitHubTrendingTool
 from src.tools.github_pr import GitHubPRTool
 from src.tools.github_issue import GitHubIssueTool
 from src.utils.dashboard import DeveloperDashboard
+from src.utils.llm_factory import LLMFactory
 from src.utils.logger import get_logger
 from src.utils.langchain_checkpointer import create_checkpointer
 from src.utils.memory_manager import HybridMemoryManager
@@ -49,6 +50,10 @@ async def lifespan(app: FastAPI):
     logger.info("Starting HubMind API server...")
     init_db()
     logger.info("Database initialized")
+    # Import the default provider's package now rather than on the first chat request
+    warmup_errors = await asyncio.to_thread(LLMFactory.warmup, [Config.LLM_PROVIDER])
+    for provider, error in warmup_errors.items():
+        logger.warning(f"LLM provider {provider} warmup failed: {error}")
     yield
     logger.info("Shutting down HubMind API server...")
 
@@ -426,6 +431,16 @@ def _qa_agent_for_user(db: Session, user: User) -> Optional[HubMindQAAgent]:
     )
 
 
+def _dashboard_for_user(db: Session, user: Optional[User]) -> DeveloperDashboard:
+    """Return a DeveloperDashboard using the user's GitHub token, or the shared one."""
+    if user:
+        settings = get_user_settings(db, user.id)
+        token = (settings.github_token or "") if settings else ""
+        if token:
+            return DeveloperDashboard(github_token=token)
+    return get_dashboard()
+
+
 def _github_for_user(db: Session, user: User):
     """Return PyGithub instance for user's token, or None."""
     settings = get_user_settings(db, user.id)
@@ -978,17 +993,31 @@ async def get_repo_health(
 ):
     """Get repository health metrics"""
     try:
-        if user:
-            settings = get_user_settings(db, user.id)
-            token = (settings.github_token or "") if settings else ""
-            dashboard = DeveloperDashboard(github_token=token) if token else get_dashboard()
-        else:
-            dashboard = get_dashboard()
+        dashboard = _dashboard_for_user(db, user)
         health = dashboard.get_repo_health(request.repo, days=request.days)
         return health
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/health-repo/stream")
+async def stream_repo_health(
+    request: HealthRequest,
+    user: Optional[User] = Depends(get_current_user_optional),
+    db: Session = Depends(get_db),
+):
+    """Stream repository health metrics as NDJSON, one line per part as each query finishes"""
+    try:
+        dashboard = _dashboard_for_user(db, user)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    def ndjson_stream():
+        for part in dashboard.stream_repo_health(request.repo, days=request.days):
+            yield json.dumps(part, ensure_ascii=False) + "\n"
+
+    # Sync generator: Starlette iterates it in a worker thread
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
+
 # GitHub Browser API
 class GitHubRepoRequest(BaseModel):
     repo: str
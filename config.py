@@ -18,6 +18,7 @@ class Config:
     # LLM Provider Configuration
     LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "deepseek")  # deepseek, openai, anthropic, google, azure, ollama, groq, openai_compatible
     LLM_MODEL: str = os.getenv("LLM_MODEL", "")  # Optional: override default model
+    LLM_MODEL_FAST: str = os.getenv("LLM_MODEL_FAST", "")  # Optional: cheaper model for routing / context selection (e.g. gpt-4o-mini)
 
     # OpenAI API
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
@@ -58,6 +59,8 @@ class Config:
     DEFAULT_TRENDING_LIMIT: int = 10
     DEFAULT_PR_LIMIT: int = 20
     DEFAULT_ISSUE_LIMIT: int = 20
+    # Title similarity (0-100) above which create_issue returns the existing issue instead
+    ISSUE_DEDUP_THRESHOLD: int = int(os.getenv("ISSUE_DEDUP_THRESHOLD", "85"))
 
     @classmethod
     def validate(cls) -> bool:
@@ -215,8 +215,9 @@ def create_issue(
             console.print(f"[red]Error: {result['error']}[/red]")
             return
 
+        heading = "Matching Issue Already Exists" if result.get("deduplicated") else "Issue Created Successfully!"
         info = f"""
-**Issue Created Successfully!**
+**{heading}**
 
 **#{result['number']}**: {result['title']}
 **URL**: {result['url']}
@@ -273,11 +273,8 @@ Always be helpful, concise, and provide actionable insights. Format your respons
         except (BrokenPipeError, ConnectionError, OSError) as conn_error:
             return "连接中断，请刷新页面重试。"
         except Exception as e:
-            import traceback
-            error_detail = traceback.format_exc()
-            # Log error for debugging (but don't expose to user)
-            logger.error(f"Agent error: {str(e)}")
-            logger.debug(f"Error detail: {error_detail}")
+            # Log error with traceback for debugging (but don't expose to user)
+            logger.exception("Agent error: %s", e)
             return f"处理请求时出错: {str(e)}。请检查配置是否正确。"
 
     def chat_stream(self, message: str, chat_history: Optional[List] = None, session_id: Optional[int] = None):
@@ -517,15 +514,11 @@ Always be helpful, concise, and provide actionable insights. Format your respons
                     logger.debug(f"[AGENT_STREAM] Streaming completed: {chunk_count} chunks, {len(previous_content)} chars yielded")
 
             except (BrokenPipeError, ConnectionError, OSError) as conn_error:
-                logger.warning(f"Connection error during streaming: {str(conn_error)}")
+                logger.warning("Connection error during streaming: %s", conn_error)
                 yield f"\n\n连接错误: {str(conn_error)}。请重试。"
             except Exception as e:
-                logger.error(f"Error in chat_stream: {str(e)}")
-                import traceback
-                logger.debug(f"Traceback: {traceback.format_exc()}")
+                logger.exception("Error in chat_stream: %s", e)
                 yield f"\n\n处理消息时出错: {str(e)}"
         except Exception as e:
-            logger.error(f"Error in chat_stream: {str(e)}")
-            import traceback
-            logger.debug(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error in chat_stream: %s", e)
             yield f"处理消息时出错: {str(e)}"
@@ -1,7 +1,10 @@
 """
 HubMind QA Agent - Repository and Code Question Answering
 """
-from typing import Dict, List, Optional
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage, SystemMessage
 from github import Github
@@ -10,8 +13,11 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from config import Config
 from src.utils.llm_factory import LLMFactory
+from src.utils.logger import get_logger
 from typing import Optional
 
+logger = get_logger(__name__)
+
 
 class HubMindQAAgent:
     """QA Agent for answering questions about repositories and code"""
@@ -58,9 +64,33 @@ class HubMindQAAgent:
             temperature=0.2,
             **llm_kwargs
         )
+        # Cheap model for the context-selection step (optional). Without it,
+        # every context section is gathered as before. LLM_MODEL_FAST names a
+        # model of the configured provider, so it is only used when this agent
+        # talks to that same provider / endpoint.
+        self.router_llm = None
+        if (
+            Config.LLM_MODEL_FAST
+            and provider == Config.LLM_PROVIDER.lower()
+            and "base_url" not in llm_kwargs
+        ):
+            router_kwargs = {k: v for k, v in llm_kwargs.items() if k != "model"}
+            self.router_llm = LLMFactory.create_llm(
+                provider=provider,
+                model_name=Config.LLM_MODEL_FAST,
+                temperature=0,
+                **router_kwargs
+            )
         token = github_token or Config.GITHUB_TOKEN
         self.github = Github(token)
 
+        self.route_prompt_template = """Decide which repository context is needed to answer the question below.
+
+Question: {question}
+
+Reply with JSON only, no explanation:
+{{"needs_readme": true|false, "needs_commits": true|false, "needs_contributors": true|false}}"""
+
         self.qa_prompt_template = """You are a helpful GitHub repository assistant. Answer questions about repositories based on the provided context.
 
 Context about the repository:
@@ -86,17 +116,9 @@ Provide a clear, concise answer. If you don't have enough information, say so.""
             Answer dictionary
         """
         try:
-            repo = self.github.get_repo(repo_full_name)
-
-            # Gather context
-            context = self._gather_repo_context(repo)
+            messages, context = self._prepare_messages(repo_full_name, question)
 
             # Generate answer using LLM directly
-            prompt = self.qa_prompt_template.format(context=context, question=question)
-            messages = [
-                SystemMessage(content="You are a helpful GitHub repository assistant."),
-                HumanMessage(content=prompt)
-            ]
             response = self.llm.invoke(messages)
             answer = response.content if hasattr(response, "content") else str(response)
 
@@ -113,8 +135,160 @@ Provide a clear, concise answer. If you don't have enough information, say so.""
                 "repo": repo_full_name
             }
 
-    def _gather_repo_context(self, repo) -> str:
-        """Gather context about a repository"""
+    def answer_repo_questions_batch(
+        self,
+        pairs: List[Tuple[str, str]],
+        max_concurrency: int = 8
+    ) -> List[Dict]:
+        """
+        Answer many (repo_full_name, question) pairs at once
+
+        Repository context is gathered concurrently and all prompts are sent
+        through a single llm.batch() call.
+
+        Args:
+            pairs: List of (repo_full_name, question)
+            max_concurrency: Maximum concurrent GitHub fetches / LLM requests
+
+        Returns:
+            List of answer dictionaries, in the same order as pairs
+        """
+        if not pairs:
+            return []
+
+        def prepare(pair: Tuple[str, str]):
+            try:
+                return self._prepare_messages(*pair)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            prepared = list(executor.map(prepare, pairs))
+
+        ready = [i for i, p in enumerate(prepared) if not isinstance(p, Exception)]
+        responses = []
+        if ready:
+            responses = self.llm.batch(
+                [prepared[i][0] for i in ready],
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True,
+            )
+        response_by_index = dict(zip(ready, responses))
+
+        results = []
+        for i, (repo_full_name, question) in enumerate(pairs):
+            outcome = response_by_index.get(i, prepared[i])
+            if isinstance(outcome, Exception):
+                results.append({
+                    "question": question,
+                    "answer": f"Error: {str(outcome)}",
+                    "repo": repo_full_name
+                })
+                continue
+            answer = outcome.content if hasattr(outcome, "content") else str(outcome)
+            results.append({
+                "question": question,
+                "answer": answer,
+                "repo": repo_full_name,
+                "sources": self._extract_sources(prepared[i][1])
+            })
+        return results
+
+    def _prepare_messages(self, repo_full_name: str, question: str) -> Tuple[List, str]:
+        """Route the question, gather repository context and build the LLM messages"""
+        repo = self.github.get_repo(repo_full_name)
+
+        # Stage 1: decide which sections are worth fetching
+        sections = self._route_question(question)
+
+        # Stage 2: gather only those sections
+        context = self._gather_repo_context(repo, question=question, sections=sections)
+
+        prompt = self.qa_prompt_template.format(context=context, question=question)
+        messages = [
+            SystemMessage(content="You are a helpful GitHub repository assistant."),
+            HumanMessage(content=prompt)
+        ]
+        return messages, context
+
+    def _route_question(self, question: str) -> Dict[str, bool]:
+        """
+        Ask the fast model which context sections the question needs.
+        Falls back to fetching everything when no fast model is configured
+        or its reply cannot be parsed.
+        """
+        sections = {"needs_readme": True, "needs_commits": True, "needs_contributors": True}
+        if self.router_llm is None:
+            return sections
+        try:
+            response = self.router_llm.invoke([
+                HumanMessage(content=self.route_prompt_template.format(question=question))
+            ])
+            content = response.content if hasattr(response, "content") else str(response)
+            m = re.search(r"\{.*\}", content, re.DOTALL)
+            if m:
+                flags = json.loads(m.group(0))
+                for key in sections:
+                    if key in flags:
+                        sections[key] = bool(flags[key])
+        except Exception as e:
+            logger.warning(f"Question routing failed, gathering full context: {str(e)}")
+        return sections
+
+    def _select_readme_chunks(
+        self,
+        readme: str,
+        question: Optional[str],
+        chunk_chars: int = 2000,
+        max_chars: int = 2000
+    ) -> str:
+        """
+        Split the README into ~500-token chunks and keep the ones sharing the
+        most terms with the question, up to max_chars.
+        """
+        if not question or len(readme) <= max_chars:
+            return readme[:max_chars]
+
+        chunks = []
+        current = ""
+        for block in re.split(r"\n\s*\n", readme):
+            if current and len(current) + len(block) > chunk_chars:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{block}" if current else block
+        if current:
+            chunks.append(current)
+
+        terms = set(re.findall(r"\w+", question.lower()))
+        ranked = sorted(
+            range(len(chunks)),
+            key=lambda i: len(terms & set(re.findall(r"\w+", chunks[i].lower()))),
+            reverse=True
+        )
+
+        # The best chunk alone may exceed the budget: then it is the excerpt
+        if len(chunks[ranked[0]]) >= max_chars:
+            return chunks[ranked[0]][:max_chars]
+
+        # Only take whole chunks that fit, so no selected chunk gets cut off
+        selected = []
+        used = 0
+        for i in ranked:
+            size = len(chunks[i]) + (2 if selected else 0)  # "\n\n" separator
+            if used + size <= max_chars:
+                selected.append(i)
+                used += size
+        # Keep original README order for readability
+        return "\n\n".join(chunks[i] for i in sorted(selected))
+
+    def _gather_repo_context(
+        self,
+        repo,
+        question: Optional[str] = None,
+        sections: Optional[Dict[str, bool]] = None
+    ) -> str:
+        """Gather context about a repository, skipping sections not requested"""
+        sections = sections or {}
         context_parts = []
 
         # Basic info
@@ -131,29 +305,34 @@ Provide a clear, concise answer. If you don't have enough information, say so.""
             context_parts.append(f"Topics: {', '.join(topics)}")
 
         # README
-        try:
-            readme = repo.get_readme()
-            readme_content = readme.decoded_content.decode('utf-8')[:2000]
-            context_parts.append(f"\nREADME (excerpt):\n{readme_content}")
-        except:
-            pass
+        if sections.get("needs_readme", True):
+            try:
+                readme = repo.get_readme()
+                readme_content = self._select_readme_chunks(
+                    readme.decoded_content.decode('utf-8'), question
+                )
+                context_parts.append(f"\nREADME (excerpt):\n{readme_content}")
+            except:
+                pass
 
         # Recent commits
-        try:
-            commits = list(repo.get_commits()[:5])
-            context_parts.append("\nRecent commits:")
-            for commit in commits:
-                context_parts.append(f"- {commit.commit.message[:100]}")
-        except:
-            pass
+        if sections.get("needs_commits", True):
+            try:
+                commits = list(repo.get_commits()[:5])
+                context_parts.append("\nRecent commits:")
+                for commit in commits:
+                    context_parts.append(f"- {commit.commit.message[:100]}")
+            except:
+                pass
 
         # Contributors
-        try:
-            contributors = list(repo.get_contributors()[:10])
-            contributor_names = [c.login for c in contributors]
-            context_parts.append(f"\nTop Contributors: {', '.join(contributor_names)}")
-        except:
-            pass
+        if sections.get("needs_contributors", True):
+            try:
+                contributors = list(repo.get_contributors()[:10])
+                contributor_names = [c.login for c in contributors]
+                context_parts.append(f"\nTop Contributors: {', '.join(contributor_names)}")
+            except:
+                pass
 
         # Files structure (top level)
         try:
@@ -15,6 +15,9 @@ from src.tools.github_pr import GitHubPRTool
 from src.tools.github_issue import GitHubIssueTool
 from src.agents.hubmind_agent import HubMindAgent
 from src.agents.graph import create_supervisor_graph
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class SupervisorAgent:
@@ -97,7 +100,6 @@ class SupervisorAgent:
         except (BrokenPipeError, ConnectionError, OSError):
             return "连接中断，请刷新页面重试。"
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            logger.exception("Supervisor error: %s", e)
             return f"处理请求时出错: {str(e)}。请检查配置是否正确。"
 
@@ -1,7 +1,8 @@
 """
 GitHub Issue Management Tools
 """
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 from github import Github
 import sys
 from pathlib import Path
@@ -14,6 +15,7 @@ class GitHubIssueTool:
 
     def __init__(self, github_token: Optional[str] = None):
         token = github_token or Config.GITHUB_TOKEN
+        self._token = token
         self.github = Github(token)
 
     def create_issue_from_text(
@@ -44,6 +46,19 @@ class GitHubIssueTool:
             # Check for similar issues
             similar_issues = self._find_similar_issues(repo, parsed["title"])
 
+            # Return the existing issue instead of filing a near-duplicate
+            duplicate = self._find_duplicate(parsed["title"], similar_issues)
+            if duplicate:
+                return {
+                    "number": duplicate["number"],
+                    "title": duplicate["title"],
+                    "state": "open",
+                    "url": duplicate["url"],
+                    "similar_issues": similar_issues,
+                    "labels": duplicate.get("labels", []),
+                    "deduplicated": True,
+                }
+
             # Create issue
             issue = repo.create_issue(
                 title=parsed["title"],
@@ -59,6 +74,7 @@ class GitHubIssueTool:
                 "url": issue.html_url,
                 "similar_issues": similar_issues,
                 "labels": [label.name for label in issue.labels],
+                "deduplicated": False,
             }
         except Exception as e:
             return {"error": str(e)}
@@ -81,7 +97,10 @@ class GitHubIssueTool:
             List of issue information
         """
         try:
-            repo = self.github.get_repo(repo_full_name)
+            # Page size matched to limit, on a short-lived client so the shared
+            # one (used concurrently by other requests) keeps its default
+            paged_github = Github(self._token, per_page=max(1, min(limit, 100)))
+            repo = paged_github.get_repo(repo_full_name)
             issues = []
 
             for issue in repo.get_issues(state=state, sort="updated", direction="desc"):
@@ -93,7 +112,8 @@ class GitHubIssueTool:
         except Exception as e:
             return [{"error": str(e)}]
 
-    def classify_issue(self, text: str) -> Dict:
+    @staticmethod
+    def classify_issue(text: str) -> Dict:
         """
         Classify issue type (bug/feature/docs/question)
 
@@ -140,29 +160,11 @@ class GitHubIssueTool:
         Returns:
             Parsed issue data
         """
-        # Simple parsing - can be enhanced with NLP
-        lines = text.strip().split('\n')
-        title = lines[0] if lines else text[:100]
-
-        # If title is too long, truncate it
-        if len(title) > 100:
-            title = title[:97] + "..."
-
-        body = '\n'.join(lines[1:]) if len(lines) > 1 else text
-
-        # Classify issue
-        classification = self.classify_issue(text)
-
-        # Add classification to body
-        if body:
-            body = f"**Type:** {classification['type']}\n**Priority:** {classification['priority']}\n\n{body}"
-        else:
-            body = f"**Type:** {classification['type']}\n**Priority:** {classification['priority']}"
-
+        title, body, labels = _parse_issue_text_cached(text)
         return {
             "title": title,
             "body": body,
-            "suggested_labels": classification["suggested_labels"]
+            "suggested_labels": list(labels)
         }
 
     def _find_similar_issues(
@@ -194,6 +196,7 @@ class GitHubIssueTool:
                         "number": issue.number,
                         "title": issue.title,
                         "url": issue.html_url,
+                        "labels": [label.name for label in issue.labels],
                     })
                     if len(similar) >= limit:
                         break
@@ -202,17 +205,76 @@ class GitHubIssueTool:
         except:
             return []
 
+    def _find_duplicate(
+        self,
+        title: str,
+        similar_issues: List[Dict]
+    ) -> Optional[Dict]:
+        """
+        Return the most similar issue if its title similarity reaches
+        Config.ISSUE_DEDUP_THRESHOLD, otherwise None
+        """
+        best = None
+        best_score = 0.0
+        for similar in similar_issues:
+            score = self._title_similarity(title, similar["title"])
+            if score > best_score:
+                best, best_score = similar, score
+        if best and best_score >= Config.ISSUE_DEDUP_THRESHOLD:
+            return best
+        return None
+
+    @staticmethod
+    def _title_similarity(a: str, b: str) -> float:
+        """Jaccard similarity (0-100) of the character trigram sets of two titles"""
+        def trigrams(text: str) -> set:
+            text = " ".join(text.lower().split())
+            return {text[i:i + 3] for i in range(max(len(text) - 2, 1))}
+
+        ta, tb = trigrams(a), trigrams(b)
+        if not ta or not tb:
+            return 0.0
+        return 100.0 * len(ta & tb) / len(ta | tb)
+
     def _issue_to_dict(self, issue) -> Dict:
-        """Convert issue object to dictionary"""
+        """Convert issue object to dictionary (only the fields issue listings display)"""
         return {
             "number": issue.number,
             "title": issue.title,
             "state": issue.state,
             "author": issue.user.login,
-            "created_at": issue.created_at.isoformat(),
-            "updated_at": issue.updated_at.isoformat(),
-            "comments": issue.comments,
             "labels": [label.name for label in issue.labels],
-            "assignees": [assignee.login for assignee in issue.assignees],
             "url": issue.html_url,
         }
+
+
+@lru_cache(maxsize=512)
+def _parse_issue_text_cached(text: str) -> Tuple[str, str, Tuple[str, ...]]:
+    """
+    Memoized core of GitHubIssueTool._parse_issue_text (scripts often file
+    many issues from the same text). Returns a hashable (title, body, labels).
+    """
+    # Simple parsing - can be enhanced with NLP
+    stripped = text.strip()
+    if "\n" in stripped:
+        newline = stripped.index("\n")
+        title = stripped[:newline]
+        body = stripped[newline + 1:]
+    else:
+        title = stripped
+        body = text
+
+    # If title is too long, truncate it
+    if len(title) > 100:
+        title = title[:97] + "..."
+
+    # Classify issue
+    classification = GitHubIssueTool.classify_issue(text)
+
+    # Add classification to body
+    if body:
+        body = f"**Type:** {classification['type']}\n**Priority:** {classification['priority']}\n\n{body}"
+    else:
+        body = f"**Type:** {classification['type']}\n**Priority:** {classification['priority']}"
+
+    return title, body, tuple(classification["suggested_labels"])
@@ -1,21 +1,83 @@
 """
 GitHub PR Analysis Tools
 """
-from typing import List, Dict, Optional
+import heapq
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from operator import attrgetter
+from typing import Any, FrozenSet, List, Dict, Iterator, Optional, Tuple
 from datetime import datetime, timedelta
 from github import Github
-import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent.parent))
 from config import Config
+from src.utils import github_api
+
+# Every field PRRecord needs, shared by the queries below
+PR_FIELDS_FRAGMENT = """
+fragment PRFields on PullRequest {
+  number title state url createdAt updatedAt additions deletions
+  author { login }
+  comments { totalCount }
+  reviewThreads { totalCount }
+}
+"""
+
+# Pull requests ordered by last update, so a page of 50 PRs costs one
+# request instead of one per PR / attribute.
+PULL_REQUESTS_QUERY = """
+query($owner: String!, $name: String!, $cursor: String, $states: [PullRequestState!], $withReviews: Boolean!) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: 50, after: $cursor, states: $states, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { endCursor hasNextPage }
+      nodes {
+        ...PRFields
+        reviews(last: 50) @include(if: $withReviews) { nodes { state } }
+      }
+    }
+  }
+}
+""" + PR_FIELDS_FRAGMENT
+
+# Search API variant: the "updated:>=" qualifier filters by date server-side
+SEARCH_PULL_REQUESTS_QUERY = """
+query($q: String!, $first: Int!, $cursor: String) {
+  search(query: $q, type: ISSUE, first: $first, after: $cursor) {
+    pageInfo { endCursor hasNextPage }
+    nodes { ...PRFields }
+  }
+}
+""" + PR_FIELDS_FRAGMENT
+
+
+@dataclass(slots=True)
+class PRRecord:
+    """Compact per-PR record used while scanning; converted to a dict only on return"""
+    number: int
+    title: str
+    state: str
+    author: str
+    created_at: str
+    updated_at: str
+    comments: int
+    review_comments: int
+    additions: Optional[int]
+    deletions: Optional[int]
+    url: str
+    value_score: Optional[float] = None
 
 
 class GitHubPRTool:
     """Tool for analyzing GitHub Pull Requests"""
 
+    # Collaborator lists change rarely; reuse them across analyses for this long
+    MAINTAINERS_TTL = 600  # seconds
+
     def __init__(self, github_token: Optional[str] = None):
         token = github_token or Config.GITHUB_TOKEN
         self.github = Github(token)
+        self._token = token
+        # repo_full_name -> (fetched_at, maintainer logins)
+        self._maintainers: Dict[str, Tuple[float, FrozenSet[str]]] = {}
 
     def get_today_prs(
         self,
@@ -33,27 +95,39 @@ class GitHubPRTool:
             List of PR information
         """
         try:
-            repo = self.github.get_repo(repo_full_name)
             today = datetime.now().date()
-
+            today_start = self._day_start(today)
+            week_start = self._day_start(today - timedelta(days=7))
+
+            # Let the Search API drop anything older than a week, newest first:
+            # today's PRs are a prefix of the result, so one request serves both cases.
+            query = (
+                f"repo:{repo_full_name} is:pr "
+                f"updated:>={week_start[:10]} sort:updated-desc"
+            )
             prs = []
-            # First try to get PRs updated today
-            for pr in repo.get_pulls(state="all", sort="updated", direction="desc"):
-                if pr.updated_at.date() == today:
-                    prs.append(self._pr_to_dict(pr))
-                    if len(prs) >= limit:
-                        break
+            recent = []
+            cursor = None
+            # Pages hold at most 100 results; follow the cursor until limit is reached
+            while len(recent) < limit:
+                search = self._gql(SEARCH_PULL_REQUESTS_QUERY, {
+                    "q": query,
+                    "first": min(limit - len(recent), 100),
+                    "cursor": cursor,
+                })["search"]
+                for node in search["nodes"]:
+                    if not node:
+                        continue
+                    record = self._node_to_record(node)
+                    recent.append(record)
+                    if node["updatedAt"] >= today_start:
+                        prs.append(record)
+                if not search["pageInfo"]["hasNextPage"]:
+                    break
+                cursor = search["pageInfo"]["endCursor"]
 
             # If no PRs updated today, get recent PRs (last 7 days)
-            if len(prs) == 0:
-                week_ago = datetime.now().date() - timedelta(days=7)
-                for pr in repo.get_pulls(state="all", sort="updated", direction="desc"):
-                    if pr.updated_at.date() >= week_ago:
-                        prs.append(self._pr_to_dict(pr))
-                        if len(prs) >= limit:
-                            break
-
-            return prs
+            return [self._record_to_dict(record) for record in prs or recent]
         except Exception as e:
             return [{"error": str(e)}]
 
@@ -88,8 +162,8 @@ class GitHubPRTool:
             ):
                 if len(prs) >= limit:
                     break
-                prs.append(self._search_issue_to_pr_dict(issue))
-            return prs
+                prs.append(self._search_issue_to_record(issue))
+            return [self._record_to_dict(record) for record in prs]
         except Exception as e:
             return [{"error": str(e)}]
 
@@ -111,20 +185,20 @@ class GitHubPRTool:
             List of valuable PRs sorted by value score
         """
         try:
-            repo = self.github.get_repo(repo_full_name)
-            today = datetime.now().date()
-
-            prs = []
-            for pr in repo.get_pulls(state="all", sort="updated", direction="desc"):
-                if pr.updated_at.date() == today:
-                    pr_dict = self._pr_to_dict(pr)
-                    pr_dict["value_score"] = self._calculate_value_score(pr)
-                    if pr_dict["comments"] >= min_comments:
-                        prs.append(pr_dict)
-
-            # Sort by value score
-            prs.sort(key=lambda x: x["value_score"], reverse=True)
-            return prs[:limit]
+            today_start = self._day_start(datetime.now().date())
+
+            def scored_prs() -> Iterator[PRRecord]:
+                for node in self._iter_pull_nodes(repo_full_name):
+                    if node["updatedAt"] < today_start:
+                        return
+                    record = self._node_to_record(node)
+                    if record.comments >= min_comments:
+                        record.value_score = self._value_score(record)
+                        yield record
+
+            # Keep only the top `limit` by value score instead of sorting everything
+            top = heapq.nlargest(limit, scored_prs(), key=attrgetter("value_score"))
+            return [self._record_to_dict(record) for record in top]
         except Exception as e:
             return [{"error": str(e)}]
 
@@ -147,8 +221,16 @@ class GitHubPRTool:
             repo = self.github.get_repo(repo_full_name)
             pr = repo.get_pull(pr_number)
 
+            # Files, reviews, collaborators and comments are independent requests;
+            # fetch them concurrently so latency is the slowest one, not the sum.
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                f_files = executor.submit(lambda: list(pr.get_files()))
+                f_reviews = executor.submit(lambda: [r.state for r in pr.get_reviews()])
+                f_collabs = executor.submit(self._get_maintainers, repo_full_name, repo)
+                f_comments = executor.submit(lambda: list(pr.get_issue_comments()))
+
             # Get files changed
-            files = pr.get_files()
+            files = f_files.result()
             file_changes = []
             total_additions = 0
             total_deletions = 0
@@ -165,18 +247,18 @@ class GitHubPRTool:
                 total_deletions += file.deletions
 
             # Get reviews
-            reviews = pr.get_reviews()
+            review_states = f_reviews.result()
             review_summary = {
-                "total": reviews.totalCount,
-                "approved": sum(1 for r in reviews if r.state == "APPROVED"),
-                "changes_requested": sum(1 for r in reviews if r.state == "CHANGES_REQUESTED"),
+                "total": len(review_states),
+                "approved": review_states.count("APPROVED"),
+                "changes_requested": review_states.count("CHANGES_REQUESTED"),
             }
 
             # Check for maintainer participation
-            maintainers = [collab.login for collab in repo.get_collaborators()]
+            maintainers = f_collabs.result()
             maintainer_participated = any(
                 comment.user.login in maintainers
-                for comment in pr.get_issue_comments()
+                for comment in f_comments.result()
             )
 
             return {
@@ -206,7 +288,10 @@ class GitHubPRTool:
         min_comments: int = 10
     ) -> List[Dict]:
         """
-        Detect controversial PRs (high engagement with mixed opinions)
+        Detect controversial PRs (high engagement with mixed opinions), most
+        controversial first. Review states are read from each PR's last 50
+        reviews, so an early CHANGES_REQUESTED on a very long review thread
+        may not be seen.
 
         Args:
             repo_full_name: Repository full name (owner/repo)
@@ -216,60 +301,131 @@ class GitHubPRTool:
             List of controversial PRs
         """
         try:
-            repo = self.github.get_repo(repo_full_name)
-            today = datetime.now().date()
+            today_start = self._day_start(datetime.now().date())
 
             controversial = []
-            for pr in repo.get_pulls(state="open", sort="comments", direction="desc"):
-                if pr.updated_at.date() == today and pr.comments >= min_comments:
-                    # Check for mixed review states
-                    reviews = pr.get_reviews()
-                    has_approved = any(r.state == "APPROVED" for r in reviews)
-                    has_changes = any(r.state == "CHANGES_REQUESTED" for r in reviews)
-
-                    if has_approved and has_changes:
-                        pr_dict = self._pr_to_dict(pr)
-                        pr_dict["controversy_score"] = pr.comments + pr.review_comments
-                        controversial.append(pr_dict)
-
+            for node in self._iter_pull_nodes(repo_full_name, states=["OPEN"], with_reviews=True):
+                if node["updatedAt"] < today_start:
+                    break
+                record = self._node_to_record(node)
+                if record.comments < min_comments:
+                    continue
+
+                # Check for mixed review states
+                review_states = {r["state"] for r in (node.get("reviews") or {}).get("nodes") or []}
+                if {"APPROVED", "CHANGES_REQUESTED"} <= review_states:
+                    pr_dict = self._record_to_dict(record)
+                    pr_dict["controversy_score"] = record.comments + record.review_comments
+                    controversial.append(pr_dict)
+
+            controversial.sort(key=lambda pr: pr["controversy_score"], reverse=True)
             return controversial
         except Exception as e:
             return [{"error": str(e)}]
 
-    def _pr_to_dict(self, pr) -> Dict:
-        """Convert PR object to dictionary"""
-        return {
-            "number": pr.number,
-            "title": pr.title,
-            "state": pr.state,
-            "author": pr.user.login,
-            "created_at": pr.created_at.isoformat(),
-            "updated_at": pr.updated_at.isoformat(),
-            "comments": pr.comments,
-            "review_comments": pr.review_comments,
-            "additions": pr.additions,
-            "deletions": pr.deletions,
-            "url": pr.html_url,
-        }
-
-    def _search_issue_to_pr_dict(self, issue) -> Dict:
-        """Convert Search API issue (PR) to same dict shape as _pr_to_dict."""
-        return {
-            "number": issue.number,
-            "title": issue.title,
-            "state": issue.state,
-            "author": issue.user.login if issue.user else "",
-            "created_at": issue.created_at.isoformat(),
-            "updated_at": issue.updated_at.isoformat(),
-            "comments": 0,
-            "review_comments": 0,
-            "additions": None,
-            "deletions": None,
-            "url": issue.html_url,
-        }
+    def _get_maintainers(self, repo_full_name: str, repo) -> FrozenSet[str]:
+        """Collaborator logins for a repo, cached for MAINTAINERS_TTL seconds"""
+        cached = self._maintainers.get(repo_full_name)
+        if cached and time.monotonic() - cached[0] < self.MAINTAINERS_TTL:
+            return cached[1]
+        maintainers = frozenset(collab.login for collab in repo.get_collaborators())
+        self._maintainers[repo_full_name] = (time.monotonic(), maintainers)
+        return maintainers
+
+    def _gql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a GraphQL query with this tool's token"""
+        return github_api.graphql(query, variables, token=self._token)
+
+    def _iter_pull_nodes(
+        self,
+        repo_full_name: str,
+        states: Optional[List[str]] = None,
+        with_reviews: bool = False
+    ) -> Iterator[Dict]:
+        """
+        Yield raw GraphQL PR nodes, most recently updated first.
+        Pages are fetched lazily, so callers stop paginating by breaking.
+        """
+        owner, name = repo_full_name.split("/", 1)
+        cursor = None
+        while True:
+            data = self._gql(PULL_REQUESTS_QUERY, {
+                "owner": owner,
+                "name": name,
+                "cursor": cursor,
+                "states": states,
+                "withReviews": with_reviews,
+            })
+            repository = data.get("repository")
+            if repository is None:
+                raise ValueError(f"Repository not found: {repo_full_name}")
+            connection = repository["pullRequests"]
+            yield from connection["nodes"]
+            if not connection["pageInfo"]["hasNextPage"]:
+                return
+            cursor = connection["pageInfo"]["endCursor"]
+
+    @staticmethod
+    def _day_start(day) -> str:
+        """
+        Midnight of a date in GitHub's timestamp format. GraphQL timestamps
+        ("2024-01-31T12:00:00Z") sort lexicographically, so nodes can be compared
+        against this bound without parsing each one.
+        """
+        return f"{day.isoformat()}T00:00:00Z"
+
+    @staticmethod
+    def _node_to_record(node: Dict) -> PRRecord:
+        """Convert a GraphQL PR node to a PRRecord"""
+        return PRRecord(
+            number=node["number"],
+            title=node["title"],
+            # REST reports merged PRs as "closed"; keep that shape
+            state="open" if node["state"] == "OPEN" else "closed",
+            author=(node.get("author") or {}).get("login", "ghost"),
+            created_at=node["createdAt"].replace("Z", "+00:00"),
+            updated_at=node["updatedAt"].replace("Z", "+00:00"),
+            comments=node["comments"]["totalCount"],
+            review_comments=node["reviewThreads"]["totalCount"],
+            additions=node["additions"],
+            deletions=node["deletions"],
+            url=node["url"],
+        )
+
+    @staticmethod
+    def _record_to_dict(record: PRRecord) -> Dict:
+        """Convert a PRRecord to the returned dict; value_score only appears once scored"""
+        pr_dict = asdict(record)
+        if record.value_score is None:
+            del pr_dict["value_score"]
+        return pr_dict
+
+    def _search_issue_to_record(self, issue) -> PRRecord:
+        """Convert Search API issue (PR) to a PRRecord"""
+        return PRRecord(
+            number=issue.number,
+            title=issue.title,
+            state=issue.state,
+            author=issue.user.login if issue.user else "",
+            created_at=issue.created_at.isoformat(),
+            updated_at=issue.updated_at.isoformat(),
+            comments=0,
+            review_comments=0,
+            additions=None,
+            deletions=None,
+            url=issue.html_url,
+        )
 
     def _calculate_value_score(self, pr) -> float:
         """Calculate a value score for a PR"""
+        return self._value_score(pr)
+
+    @staticmethod
+    def _value_score(pr) -> float:
+        """
+        Calculate a value score from anything exposing comments, review_comments,
+        additions, deletions and state attributes (PRRecord or a PyGithub PR)
+        """
         score = 0.0
 
         # Comments and engagement
@@ -3,30 +3,47 @@ AI 分析总结模块：基于 LLM 对 trending 列表做摘要与洞察。
 
 流程：结构化 repo 列表 -> 本模块 (LLM 调用) -> 自然语言总结
 """
+import io
 from typing import List, Dict, Optional
 
-import sys
-from pathlib import Path
-_root = Path(__file__).resolve().parent.parent.parent.parent
-if str(_root) not in sys.path:
-    sys.path.insert(0, str(_root))
+from langchain_core.messages import HumanMessage, SystemMessage
 from config import Config
 from src.utils.llm_factory import LLMFactory
 
+# 固定不变的指令放在 system 消息中，每次调用保持同一前缀，便于服务端前缀缓存复用
+_STATIC_PREAMBLE = """你是一个 GitHub 热门项目分析助手。用户会给出从 GitHub Trending 抓取的热门仓库列表。
 
-def format_repos_for_prompt(repos: List[Dict], max_items: int = 20) -> str:
-    """将 repo 列表格式化为给 LLM 的上下文文本。"""
+请用 2～4 句话概括整体趋势（例如：集中在哪些方向、语言或主题），并可选地指出 1～2 个值得关注的项目及原因。语气简洁、信息量足。
+
+请直接给出你的总结，不要复述整份列表。"""
+
+# 仓库列表上下文的字符上限，无论 max_items 多大，prompt 长度（token 成本）都有界
+PROMPT_MAX_CHARS = 4000
+
+
+def format_repos_for_prompt(
+    repos: List[Dict],
+    max_items: int = 20,
+    max_chars: int = PROMPT_MAX_CHARS,
+) -> str:
+    """将 repo 列表格式化为给 LLM 的上下文文本，总长度不超过 max_chars（按整条截断）。"""
     if not repos:
         return "（暂无仓库数据）"
-    lines = []
+    buf = io.StringIO()
+    size = 0
     for i, r in enumerate(repos[:max_items], 1):
-        name = r.get("name", "")
-        desc = (r.get("description") or "")[:200]
-        stars = r.get("stars", 0)
-        lang = r.get("language") or "N/A"
-        url = r.get("url", "")
-        lines.append(f"{i}. **{name}** | ⭐ {stars} | {lang}\n   {desc}\n   {url}")
-    return "\n\n".join(lines)
+        entry = (
+            f"{i}. **{r.get('name', '')}** | ⭐ {r.get('stars', 0)} | {r.get('language') or 'N/A'}\n"
+            f"   {(r.get('description') or '')[:200]}\n"
+            f"   {r.get('url', '')}"
+        )
+        sep = "\n\n" if size else ""
+        if size and size + len(sep) + len(entry) > max_chars:
+            break
+        buf.write(sep)
+        buf.write(entry)
+        size += len(sep) + len(entry)
+    return buf.getvalue()
 
 
 def summarize_with_llm(
@@ -44,10 +61,9 @@ def summarize_with_llm(
         return "暂无热门仓库数据。"
 
     provider = (llm_provider or Config.LLM_PROVIDER).lower()
-    llm_kwargs = {}
-    if llm_api_key:
-        llm_kwargs["api_key"] = llm_api_key
 
+    # LLMFactory 按配置缓存实例，重复调用复用同一客户端与连接池
+    llm_kwargs = {"api_key": llm_api_key} if llm_api_key else {}
     try:
         llm = LLMFactory.create_llm(provider=provider, temperature=0.3, **llm_kwargs)
     except Exception:
@@ -57,18 +73,23 @@ def summarize_with_llm(
     lang_hint = f"（编程语言筛选: {language}）" if language else ""
     since_hint = {"daily": "今日", "weekly": "本周", "monthly": "本月"}.get(since, since)
 
-    prompt = f"""你是一个 GitHub 热门项目分析助手。下面是从 GitHub Trending 抓取的 {since_hint} 热门仓库列表{lang_hint}。
-
-请用 2～4 句话概括整体趋势（例如：集中在哪些方向、语言或主题），并可选地指出 1～2 个值得关注的项目及原因。语气简洁、信息量足。
+    prompt = f"""下面是从 GitHub Trending 抓取的 {since_hint} 热门仓库列表{lang_hint}。
 
 仓库列表：
-{context}
-
-请直接给出你的总结，不要复述整份列表。"""
+{context}"""
+
+    if provider == "anthropic":
+        # Anthropic 需显式标记可缓存的前缀
+        system_message = SystemMessage(content=[{
+            "type": "text",
+            "text": _STATIC_PREAMBLE,
+            "cache_control": {"type": "ephemeral"},
+        }])
+    else:
+        system_message = SystemMessage(content=_STATIC_PREAMBLE)
 
     try:
-        from langchain_core.messages import HumanMessage
-        response = llm.invoke([HumanMessage(content=prompt)])
+        response = llm.invoke([system_message, HumanMessage(content=prompt)])
         if hasattr(response, "content") and response.content:
             return response.content.strip()
     except Exception:
@@ -80,9 +101,9 @@ def _plain_summary(repos: List[Dict]) -> str:
     """无 LLM 时的纯文本摘要，与原有 get_trending_summary 行为一致。"""
     if not repos:
         return "No trending repositories found."
-    summary = f"共 {len(repos)} 个热门仓库：\n\n"
+    parts = [f"共 {len(repos)} 个热门仓库：\n\n"]
     for i, repo in enumerate(repos, 1):
-        summary += f"{i}. **{repo.get('name', '')}** ({repo.get('stars', 0)} ⭐)\n"
-        summary += f"   {repo.get('description') or ''}\n"
-        summary += f"   语言: {repo.get('language') or 'N/A'} | 链接: {repo.get('url', '')}\n\n"
-    return summary
+        parts.append(f"{i}. **{repo.get('name', '')}** ({repo.get('stars', 0)} ⭐)\n")
+        parts.append(f"   {repo.get('description') or ''}\n")
+        parts.append(f"   语言: {repo.get('language') or 'N/A'} | 链接: {repo.get('url', '')}\n\n")
+    return "".join(parts)
@@ -3,16 +3,29 @@ GitHub Trending 抓取模块：请求 https://github.com/trending 页面并解
 
 流程：GitHub Trending 页面 (HTML) -> 本模块 (请求 + 解析) -> List[Dict]
 """
+import atexit
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+from src.utils.github_api import mount_retries
+from src.utils.ttl_cache import TTLCache
 
 BASE_URL = "https://github.com"
 TRENDING_PATH = "/trending"
 
+# 只为 article.Box-row 建树：页面其余部分（导航、脚本等）不生成 Python 节点对象
+_ARTICLE_STRAINER = SoupStrainer("article", class_="Box-row")
+
+# 数字解析用的正则，模块加载时编译一次
+_NUM_RE = re.compile(r"([\d.,]+)\s*([kKmM]?)")
+_MULT = {"": 1, "k": 1000, "K": 1000, "m": 1_000_000, "M": 1_000_000}
+_RE_STARS_TODAY = re.compile(r"([\d,.]+\s*k?)\s*stars?\s*today", re.I)
+
 
 def build_trending_url(
     language: Optional[str] = None,
@@ -31,15 +44,30 @@ def build_trending_url(
     return f"{BASE_URL}{path}?{qs}" if qs else f"{BASE_URL}{path}"
 
 
+# 复用连接池：多次抓取（如按语言逐个请求）不再每次重新握手 TCP/TLS
+# 限流（429 / 带 Retry-After 的 403）与 5xx 自动指数退避重试
+_SESSION = mount_retries(requests.Session())
+_SESSION.headers.update({
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
+})
+atexit.register(_SESSION.close)
+
+# 页面 HTML 缓存（按 URL）：同一时间窗内重复调用直接读内存，不再消耗请求
+HTML_CACHE_TTL = 600  # 秒
+_HTML_CACHE = TTLCache(maxsize=64, ttl=HTML_CACHE_TTL)
+
+
 def fetch_trending_html(url: str, timeout: int = 15) -> str:
-    """请求 GitHub trending 页面，返回 HTML 字符串。"""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-    }
-    resp = requests.get(url, headers=headers, timeout=timeout)
+    """请求 GitHub trending 页面，返回 HTML 字符串（HTML_CACHE_TTL 内命中缓存）。"""
+    html = _HTML_CACHE.get(url)
+    if html is not None:
+        return html
+    resp = _SESSION.get(url, timeout=timeout)
     resp.raise_for_status()
+    _HTML_CACHE.set(url, resp.text)
     return resp.text
 
 
@@ -49,6 +77,17 @@ def _text(elem) -> str:
     return (elem.get_text() or "").strip()
 
 
+def _parse_count(text: str) -> int:
+    """解析 "1,234" / "1.2k" 这类计数文本为整数；无法解析时返回 0。"""
+    m = _NUM_RE.search(text or "")
+    if not m:
+        return 0
+    try:
+        return int(float(m.group(1).replace(",", "")) * _MULT[m.group(2)])
+    except ValueError:
+        return 0
+
+
 def _parse_one_repo(article) -> Optional[Dict]:
     """从单个 article.Box-row 解析出一个 repo 字典。"""
     try:
@@ -77,50 +116,27 @@ def _parse_one_repo(article) -> Optional[Dict]:
         forks = 0
         stars_today = None
 
-        # 常见结构：span[itemprop="programmingLanguage"] 或 data-ga-click 等
-        lang_span = article.select_one('span[itemprop="programmingLanguage"]')
-        if lang_span:
-            language = _text(lang_span)
-
-        # 链接中有 stargazers / network / members
-        for link in article.select("a[href]"):
-            h = link.get("href") or ""
-            t = _text(link)
-            if "stargazers" in h:
-                # 可能带 k 如 1.2k
-                num = re.sub(r"[^\d.]", "", t) or "0"
-                try:
-                    if "k" in t.lower():
-                        stars = int(float(num.replace("k", "").strip()) * 1000)
-                    else:
-                        stars = int(float(num))
-                except ValueError:
-                    pass
-            elif "network" in h or "forks" in h:
-                num = re.sub(r"[^\d.]", "", t) or "0"
-                try:
-                    if "k" in t.lower():
-                        forks = int(float(num.replace("k", "").strip()) * 1000)
-                    else:
-                        forks = int(float(num))
-                except ValueError:
-                    pass
-
-        # stars today：部分页面有 "X stars today"
-        for span in article.select("span"):
-            txt = _text(span)
-            if "stars today" in txt.lower() or "today" in txt.lower():
-                m = re.search(r"([\d,.]+\s*k?)\s*stars?\s*today", txt, re.I)
-                if m:
-                    num = re.sub(r"[^\d.]", "", m.group(1)) or "0"
-                    try:
-                        if "k" in (m.group(1) or "").lower():
-                            stars_today = int(float(num) * 1000)
-                        else:
-                            stars_today = int(float(num))
-                    except ValueError:
-                        pass
-                break
+        # 一次遍历 article 内的 a / span，按标签分派：
+        # - span[itemprop="programmingLanguage"]：语言
+        # - a[href] 中有 stargazers / network / forks：stars、forks（可能带 k 如 1.2k）
+        # - 部分页面有 "X stars today" 的 span：stars today（找到第一个含 today 的 span 后不再检查）
+        today_seen = False
+        for node in article.find_all(["a", "span"]):
+            if node.name == "a":
+                h = node.get("href") or ""
+                if "stargazers" in h:
+                    stars = _parse_count(_text(node))
+                elif "network" in h or "forks" in h:
+                    forks = _parse_count(_text(node))
+            elif not language and node.get("itemprop") == "programmingLanguage":
+                language = _text(node)
+            elif not today_seen:
+                txt = _text(node)
+                if "today" in txt.lower():
+                    today_seen = True
+                    m = _RE_STARS_TODAY.search(txt)
+                    if m:
+                        stars_today = _parse_count(m.group(1))
 
         return {
             "name": full_name,
@@ -143,9 +159,9 @@ def parse_trending_page(html: str, limit: int = 25) -> List[Dict]:
     """
     repos = []
     try:
-        soup = BeautifulSoup(html, "lxml")
+        soup = BeautifulSoup(html, "lxml", parse_only=_ARTICLE_STRAINER)
     except Exception:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "html.parser", parse_only=_ARTICLE_STRAINER)
 
     for article in soup.select("article.Box-row"):
         if len(repos) >= limit:
@@ -170,6 +186,33 @@ def get_trending_from_page(
     url = build_trending_url(language=language, since=since)
     try:
         html = fetch_trending_html(url, timeout=timeout)
-        return parse_trending_page(html, limit=limit)
+        repos = parse_trending_page(html, limit=limit)
+        if not repos:
+            # 解析不到结果时不保留该页面缓存，下次重新抓取
+            _HTML_CACHE.pop(url)
+        return repos
     except Exception:
         return []
+
+
+def get_trending_multi(
+    languages: List[Optional[str]],
+    since: str = "daily",
+    limit: int = 25,
+    timeout: int = 15,
+    max_workers: int = 8,
+) -> Dict[Optional[str], List[Dict]]:
+    """
+    并发抓取多个语言的 trending 页面，返回 {language: repos}。
+    各请求相互独立，总耗时约为最慢的一次请求而非逐个相加；单个语言失败时其结果为空列表。
+    """
+    languages = list(dict.fromkeys(languages))
+    if not languages:
+        return {}
+
+    def fetch(lang: Optional[str]) -> List[Dict]:
+        return get_trending_from_page(language=lang, since=since, limit=limit, timeout=timeout)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(languages))) as executor:
+        results = list(executor.map(fetch, languages))
+    return dict(zip(languages, results))
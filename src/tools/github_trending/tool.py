@@ -6,18 +6,20 @@ GitHub Trending Tool：抓取 + 状态/调用入口 + AI 总结。
   -> LangChain Agent 通过本 Tool 调用
   -> AI 分析总结 (analyzer，LLM) -> 返回用户
 """
+import base64
 from typing import List, Dict, Optional
-from datetime import datetime, timedelta
-
 from github import Github
 
-import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 from config import Config
 
+from src.utils import gh_cache, github_api
+from src.utils.ttl_cache import TTLCache
 from . import scraper
 from . import analyzer
+from .utils import get_since_date
+
+# Search API 回退结果缓存：(query, limit) -> List[Dict]（纯字典，不缓存 PyGithub 对象）
+_FALLBACK_CACHE = TTLCache(maxsize=64, ttl=600)
 
 
 class GitHubTrendingTool:
@@ -34,6 +36,7 @@ class GitHubTrendingTool:
     ):
         token = github_token or Config.GITHUB_TOKEN
         self.github = Github(token) if token else None
+        self._token = token
         self.llm_provider = llm_provider or Config.LLM_PROVIDER
         self.llm_api_key = llm_api_key
 
@@ -56,18 +59,26 @@ class GitHubTrendingTool:
         # 回退：Search API（与原有逻辑一致）
         return self._get_trending_fallback(language=language, since=since, limit=limit)
 
+    def get_trending_repos_multi(
+        self,
+        languages: List[Optional[str]],
+        since: str = "daily",
+        limit: int = 10,
+    ) -> Dict[Optional[str], List[Dict]]:
+        """
+        按多个语言获取热门仓库：页面并发抓取，无结果的语言再逐个走 Search API 回退。
+        """
+        results = scraper.get_trending_multi(languages, since=since, limit=limit)
+        for language, repos in results.items():
+            if not repos:
+                results[language] = self._get_trending_fallback(
+                    language=language, since=since, limit=limit
+                )
+        return results
+
     def _get_since_date(self, since: str) -> str:
         """since -> 日期字符串，用于 Search API 查询。"""
-        today = datetime.now()
-        if since == "daily":
-            date = today - timedelta(days=1)
-        elif since == "weekly":
-            date = today - timedelta(days=7)
-        elif since == "monthly":
-            date = today - timedelta(days=30)
-        else:
-            date = today - timedelta(days=1)
-        return date.strftime("%Y-%m-%d")
+        return get_since_date(since)
 
     def _get_trending_fallback(
         self,
@@ -82,6 +93,10 @@ class GitHubTrendingTool:
         query = f"created:>{since_date}"
         if language:
             query += f" language:{language}"
+        cache_key = (query, limit)
+        cached = _FALLBACK_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
         try:
             repos = self.github.search_repositories(
                 query=query,
@@ -104,6 +119,8 @@ class GitHubTrendingTool:
                 "topics": repo.get_topics(),
                 "owner": repo.owner.login,
             })
+        if trending_list:
+            _FALLBACK_CACHE.set(cache_key, trending_list)
         return trending_list
 
     def get_trending_summary(
@@ -131,21 +148,28 @@ class GitHubTrendingTool:
         if not self.github:
             return {"error": "GITHUB_TOKEN is required"}
         try:
-            repo = self.github.get_repo(repo_full_name)
-            commits = list(repo.get_commits()[:10])
-            recent_activity = len(commits)
+            # 仓库元数据与 README 走 ETag 条件请求：未变化时返回 304，不消耗主速率限额
+            repo_data = gh_cache.cached_get(f"/repos/{repo_full_name}", token=self._token)
             try:
-                readme = repo.get_readme()
-                readme_content = readme.decoded_content.decode("utf-8", errors="replace")[:500]
+                # 一次 per_page=1 请求读 Link 头得到提交数，不拉取提交对象
+                recent_activity = min(
+                    github_api.count_items(f"/repos/{repo_full_name}/commits", token=self._token),
+                    10,
+                )
+            except Exception:
+                repo = self.github.get_repo(repo_full_name)
+                recent_activity = len(list(repo.get_commits()[:10]))
+            try:
+                readme = gh_cache.cached_get(f"/repos/{repo_full_name}/readme", token=self._token)
+                readme_content = base64.b64decode(readme["content"]).decode("utf-8", errors="replace")[:500]
             except Exception:
                 readme_content = "N/A"
-            topics = repo.get_topics()
             return {
                 "recent_commits": recent_activity,
                 "readme_preview": readme_content,
-                "topics": topics,
-                "stars_today": repo.stargazers_count,
-                "forks": repo.forks_count,
+                "topics": repo_data.get("topics", []),
+                "stars_today": repo_data["stargazers_count"],
+                "forks": repo_data["forks_count"],
             }
         except Exception as e:
             return {"error": str(e)}
@@ -0,0 +1,12 @@
+"""
+Trending 子模块共用的小工具。
+"""
+from datetime import datetime, timedelta
+
+# since -> 回溯天数；未知取值按 daily 处理
+_SINCE_DAYS = {"daily": 1, "weekly": 7, "monthly": 30}
+
+
+def get_since_date(since: str) -> str:
+    """since (daily/weekly/monthly) -> 起始日期字符串 YYYY-MM-DD，用于 Search API 查询。"""
+    return (datetime.now() - timedelta(days=_SINCE_DAYS.get(since, 1))).strftime("%Y-%m-%d")
@@ -237,7 +237,10 @@ def create_github_tools(
             if "error" in result:
                 return f"Error: {result['error']}"
 
-            response = f"Issue created successfully!\n\n"
+            if result.get("deduplicated"):
+                response = f"A matching issue already exists, no new issue was created.\n\n"
+            else:
+                response = f"Issue created successfully!\n\n"
             response += f"**#{result['number']}** {result['title']}\n"
             response += f"URL: {result['url']}\n"
             response += f"Labels: {', '.join(result['labels'])}\n"
@@ -1,20 +1,30 @@
 """
 Automation and Workflow Utilities
 """
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 from github import Github
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from config import Config
+from src.utils import gh_cache, github_api
+
+# Issues resolved / labelled per GraphQL request (one alias each)
+LABEL_BATCH_SIZE = 20
+
+# Concurrent REST label requests; GitHub advises few parallel writes per token
+LABEL_REST_WORKERS = 8
 
 
 class AutomationWorkflow:
     """Automation workflows for GitHub operations"""
 
     def __init__(self):
-        self.github = Github(Config.GITHUB_TOKEN)
+        # 100 items per page (the API maximum) instead of the default 30
+        self.github = Github(Config.GITHUB_TOKEN, per_page=100)
 
     def batch_label_issues(
         self,
@@ -34,27 +44,163 @@ class AutomationWorkflow:
             Operation result
         """
         try:
-            repo = self.github.get_repo(repo_full_name)
+            label_id, node_ids = self._resolve_label_targets(repo_full_name, label, issue_numbers)
+            if label_id is None:
+                # GraphQL can only apply existing labels; the REST endpoint creates missing ones
+                return self._batch_label_issues_rest(repo_full_name, label, issue_numbers)
+
             results = {
                 "success": [],
                 "failed": []
             }
 
+            targets = []
             for issue_num in issue_numbers:
-                try:
-                    issue = repo.get_issue(issue_num)
-                    issue.add_to_labels(label)
-                    results["success"].append(issue_num)
-                except Exception as e:
+                if node_ids.get(issue_num):
+                    targets.append(issue_num)
+                else:
                     results["failed"].append({
                         "issue": issue_num,
-                        "error": str(e)
+                        "error": "Issue not found"
                     })
 
+            # One request applies the label to a whole chunk via aliased mutations
+            for start in range(0, len(targets), LABEL_BATCH_SIZE):
+                chunk = targets[start:start + LABEL_BATCH_SIZE]
+                fields = "\n".join(
+                    f"a{i}: addLabelsToLabelable(input: {{labelableId: $id{i}, labelIds: $labelIds}}) "
+                    f"{{ clientMutationId }}"
+                    for i in range(len(chunk))
+                )
+                params = ", ".join(f"$id{i}: ID!" for i in range(len(chunk)))
+                mutation = f"mutation($labelIds: [ID!]!, {params}) {{\n{fields}\n}}"
+                variables = {"labelIds": [label_id]}
+                variables.update({f"id{i}": node_ids[num] for i, num in enumerate(chunk)})
+
+                try:
+                    data, errors = github_api.graphql_partial(mutation, variables)
+                except Exception as e:
+                    data, errors = {}, [{"message": str(e)}]
+                alias_errors = {
+                    err["path"][0]: err.get("message", "")
+                    for err in errors if err.get("path")
+                }
+                request_error = "; ".join(err.get("message", "") for err in errors if not err.get("path"))
+
+                for i, issue_num in enumerate(chunk):
+                    alias = f"a{i}"
+                    if data.get(alias) is not None and alias not in alias_errors:
+                        results["success"].append(issue_num)
+                    else:
+                        results["failed"].append({
+                            "issue": issue_num,
+                            "error": alias_errors.get(alias) or request_error or "Label not applied"
+                        })
+
             return results
         except Exception as e:
             return {"error": str(e)}
 
+    def _resolve_label_targets(
+        self,
+        repo_full_name: str,
+        label: str,
+        issue_numbers: List[int]
+    ) -> Tuple[Optional[str], Dict[int, Optional[str]]]:
+        """
+        Look up the label's node ID and the node IDs of the given issues / PRs,
+        LABEL_BATCH_SIZE numbers per aliased query
+
+        Returns:
+            (label ID or None if the label doesn't exist, {issue number: node ID or None})
+        """
+        owner, name = repo_full_name.split("/", 1)
+        unique_numbers = list(dict.fromkeys(issue_numbers))
+        label_id = None
+        node_ids: Dict[int, Optional[str]] = {}
+
+        # Always run at least once so the label is resolved even with no issues
+        for start in range(0, max(len(unique_numbers), 1), LABEL_BATCH_SIZE):
+            chunk = unique_numbers[start:start + LABEL_BATCH_SIZE]
+            fields = "\n".join(
+                f"i{i}: issueOrPullRequest(number: {int(num)}) "
+                f"{{ ... on Issue {{ id }} ... on PullRequest {{ id }} }}"
+                for i, num in enumerate(chunk)
+            )
+            variables = {"owner": owner, "name": name}
+            label_param = label_field = ""
+            if start == 0:
+                variables["label"] = label
+                label_param = ", $label: String!"
+                label_field = "label(name: $label) { id }"
+            query = (
+                f"query($owner: String!, $name: String!{label_param}) {{\n"
+                f"repository(owner: $owner, name: $name) {{\n{label_field}\n{fields}\n}}\n}}"
+            )
+            # Unknown numbers come back as per-alias errors; treat them as missing
+            data, errors = github_api.graphql_partial(query, variables)
+            repository = data.get("repository")
+            if repository is None:
+                messages = "; ".join(err.get("message", "") for err in errors)
+                raise ValueError(messages or f"Repository not found: {repo_full_name}")
+            if start == 0:
+                label_id = (repository.get("label") or {}).get("id")
+            for i, num in enumerate(chunk):
+                node_ids[num] = (repository.get(f"i{i}") or {}).get("id")
+
+        return label_id, node_ids
+
+    def _batch_label_issues_rest(
+        self,
+        repo_full_name: str,
+        label: str,
+        issue_numbers: List[int]
+    ) -> Dict:
+        """
+        Label issues over REST (also creates the label if missing). The first
+        issue is labelled on its own so GitHub creates the label exactly once;
+        the rest are labelled concurrently, and PyGithub's retry backs off on
+        rate-limit responses that carry Retry-After.
+        """
+        repo = gh_cache.get_repo(self.github, repo_full_name)
+        results = {
+            "success": [],
+            "failed": []
+        }
+
+        def label_one(issue_num: int) -> int:
+            issue = gh_cache.get_issue(self.github, repo, issue_num)
+            issue.add_to_labels(label)
+            return issue_num
+
+        # Concurrent auto-creations of the same label race and fail with 422,
+        # so label serially until one succeeds (the label then exists)
+        remaining = list(issue_numbers)
+        while remaining:
+            issue_num = remaining.pop(0)
+            try:
+                results["success"].append(label_one(issue_num))
+                break
+            except Exception as e:
+                results["failed"].append({
+                    "issue": issue_num,
+                    "error": str(e)
+                })
+
+        with ThreadPoolExecutor(max_workers=LABEL_REST_WORKERS) as executor:
+            futures = [(issue_num, executor.submit(label_one, issue_num)) for issue_num in remaining]
+
+        for issue_num, future in futures:
+            try:
+                results["success"].append(future.result())
+            except Exception as e:
+                results["failed"].append({
+                    "issue": issue_num,
+                    "error": str(e)
+                })
+
+        return results
+
     def close_stale_issues(
         self,
         repo_full_name: str,
@@ -73,35 +219,39 @@ class AutomationWorkflow:
             Operation result
         """
         try:
-            repo = self.github.get_repo(repo_full_name)
-            cutoff_date = datetime.now() - timedelta(days=days_inactive)
+            repo = gh_cache.get_repo(self.github, repo_full_name)
+            # PyGithub returns aware UTC datetimes
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_inactive)
 
             closed_issues = []
             skipped_issues = []
 
-            issues = repo.get_issues(state="open", sort="updated", direction="asc")
+            # Let the API apply the label filter instead of paging through every open issue
+            issues = repo.get_issues(
+                state="open",
+                sort="updated",
+                direction="asc",
+                **({"labels": [label]} if label else {})
+            )
 
             for issue in issues:
-                # Skip if has label filter and doesn't match
-                if label:
-                    issue_labels = [l.name for l in issue.labels]
-                    if label not in issue_labels:
-                        continue
-
-                # Check if stale
-                if issue.updated_at < cutoff_date:
-                    try:
-                        issue.edit(state="closed")
-                        closed_issues.append({
-                            "number": issue.number,
-                            "title": issue.title,
-                            "last_updated": issue.updated_at.isoformat()
-                        })
-                    except Exception as e:
-                        skipped_issues.append({
-                            "number": issue.number,
-                            "error": str(e)
-                        })
+                # Sorted by updated ascending: every remaining issue is fresh,
+                # so stop before fetching further pages
+                if issue.updated_at >= cutoff_date:
+                    break
+
+                try:
+                    issue.edit(state="closed")
+                    closed_issues.append({
+                        "number": issue.number,
+                        "title": issue.title,
+                        "last_updated": issue.updated_at.isoformat()
+                    })
+                except Exception as e:
+                    skipped_issues.append({
+                        "number": issue.number,
+                        "error": str(e)
+                    })
 
             return {
                 "closed": len(closed_issues),
@@ -130,7 +280,7 @@ class AutomationWorkflow:
             Invitation result
         """
         try:
-            repo = self.github.get_repo(repo_full_name)
+            repo = gh_cache.get_repo(self.github, repo_full_name)
 
             # Check if user is already a collaborator
             try:
@@ -168,42 +318,45 @@ class AutomationWorkflow:
             Weekly report dictionary
         """
         try:
-            repo = self.github.get_repo(repo_full_name)
-            week_ago = datetime.now() - timedelta(days=7)
+            repo = gh_cache.get_repo(self.github, repo_full_name)
+            week_ago = datetime.now(timezone.utc) - timedelta(days=7)
 
-            # Get PRs
-            prs = [pr for pr in repo.get_pulls(state="all")
-                  if pr.created_at >= week_ago]
+            # Count PRs by state in one pass (newest first, so paging stops at
+            # the first older PR). REST reports merged PRs as "closed"; merged_at
+            # tells them apart.
+            pr_states = Counter()
+            for pr in repo.get_pulls(state="all", sort="created", direction="desc"):
+                if pr.created_at < week_ago:
+                    break
+                pr_states["merged" if pr.merged_at else pr.state] += 1
 
-            # Get issues
-            issues = [issue for issue in repo.get_issues(state="all")
-                     if issue.created_at >= week_ago]
+            # Count issues by state (an issue created this week was also updated since week_ago)
+            issue_states = Counter(
+                issue.state for issue in repo.get_issues(state="all", since=week_ago)
+                if issue.created_at >= week_ago
+            )
 
             # Get commits
             commits = list(repo.get_commits(since=week_ago))
 
             # Get contributors
-            contributors = {}
+            contributors = Counter()
             for commit in commits:
                 author = commit.author
                 if author:
-                    contributors[author.login] = contributors.get(author.login, 0) + 1
+                    contributors[author.login] += 1
 
             return {
                 "repo": repo_full_name,
                 "period": "7 days",
-                "new_prs": len([pr for pr in prs if pr.state == "open"]),
-                "merged_prs": len([pr for pr in prs if pr.state == "merged"]),
-                "closed_prs": len([pr for pr in prs if pr.state == "closed"]),
-                "new_issues": len([issue for issue in issues if issue.state == "open"]),
-                "closed_issues": len([issue for issue in issues if issue.state == "closed"]),
+                "new_prs": pr_states["open"],
+                "merged_prs": pr_states["merged"],
+                "closed_prs": pr_states["closed"],
+                "new_issues": issue_states["open"],
+                "closed_issues": issue_states["closed"],
                 "commits": len(commits),
                 "contributors": len(contributors),
-                "top_contributors": sorted(
-                    contributors.items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                )[:10]
+                "top_contributors": contributors.most_common(10)
             }
         except Exception as e:
             return {"error": str(e)}
@@ -1,21 +1,66 @@
 """
 Developer Dashboard Utilities
 """
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional
+from datetime import datetime, timedelta, timezone
 from github import Github
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from config import Config
+from src.utils import gh_cache
+from src.utils import github_api
+
+# Issue, PR and commit activity in one round-trip. Each connection can be
+# switched off with its $with* flag, so follow-up calls only page through the
+# connections that still have more data.
+REPO_HEALTH_QUERY = """
+query($owner: String!, $name: String!, $since: GitTimestamp!, $updatedSince: DateTime!,
+      $issuesCursor: String, $prsCursor: String, $commitsCursor: String,
+      $withIssues: Boolean!, $withPrs: Boolean!, $withCommits: Boolean!) {
+  repository(owner: $owner, name: $name) {
+    issues(first: 100, after: $issuesCursor, states: OPEN, filterBy: {since: $updatedSince}) @include(if: $withIssues) {
+      pageInfo { endCursor hasNextPage }
+      nodes { createdAt comments(first: 1) { nodes { createdAt } } }
+    }
+    pullRequests(first: 100, after: $prsCursor, orderBy: {field: CREATED_AT, direction: DESC}) @include(if: $withPrs) {
+      pageInfo { endCursor hasNextPage }
+      nodes { createdAt merged }
+    }
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: 100, after: $commitsCursor, since: $since) @include(if: $withCommits) {
+            totalCount
+            pageInfo { endCursor hasNextPage }
+            nodes { author { user { login } } }
+          }
+        }
+      }
+    }
+  }
+}
+"""
 
 
 class DeveloperDashboard:
     """Developer dashboard for monitoring repositories"""
 
+    # Watched repos fetched concurrently; kept well under GitHub's secondary rate limit
+    ACTIVITY_MAX_WORKERS = 8
+
+    # /stats/contributors answers 202 while GitHub computes it in the background
+    STATS_RETRIES = 3
+    STATS_RETRY_DELAY = 2  # seconds, grows linearly per attempt
+
     def __init__(self, github_token: Optional[str] = None):
         token = github_token or Config.GITHUB_TOKEN
-        self.github = Github(token)
+        # 100 items per page (the API maximum) instead of the default 30
+        self.github = Github(token, per_page=100)
+        self._token = token
 
     def get_repo_health(
         self,
@@ -32,40 +77,98 @@ class DeveloperDashboard:
         Returns:
             Health metrics dictionary
         """
+        health = {}
+        for part in self.stream_repo_health(repo_full_name, days=days):
+            if "error" in part:
+                return part
+            health.update(part)
+        return health
+
+    def stream_repo_health(
+        self,
+        repo_full_name: str,
+        days: int = 30
+    ) -> Iterator[Dict]:
+        """
+        Yield repository health metrics in parts as they become available
+
+        The sub-queries (repository counters, issue/PR/commit activity,
+        contributors) run concurrently and each part is yielded as soon as its
+        query finishes, so callers can render the fast ones while the slow ones
+        are still running. Merging all parts gives the get_repo_health result.
+        On failure a single {"error": ...} part is yielded and the stream ends.
+
+        Args:
+            repo_full_name: Repository full name (owner/repo)
+            days: Number of days to analyze
+        """
+        yield {"repo": repo_full_name, "period_days": days}
+
+        since_date = datetime.now() - timedelta(days=days)
+        executor = ThreadPoolExecutor(max_workers=3)
         try:
-            repo = self.github.get_repo(repo_full_name)
-            since_date = datetime.now() - timedelta(days=days)
+            futures = [
+                executor.submit(self._health_counters, repo_full_name),
+                executor.submit(self._health_activity, repo_full_name, since_date, days),
+                executor.submit(self._health_contributors, repo_full_name, since_date),
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+        except Exception as e:
+            yield {"error": str(e)}
+        finally:
+            # A consumer that stops early shouldn't wait for the remaining queries
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _health_counters(self, repo_full_name: str) -> Dict:
+        """Stars, forks and open issues (ETag-revalidated repository metadata)"""
+        repo_data = gh_cache.cached_get(f"/repos/{repo_full_name}", token=self._token)
+        return {
+            "open_issues": repo_data["open_issues_count"],
+            "stars": repo_data["stargazers_count"],
+            "forks": repo_data["forks_count"],
+        }
 
-            # Issue response time
-            open_issues = list(repo.get_issues(state="open", sort="updated"))
-            avg_response_time = self._calculate_avg_response_time(open_issues, since_date)
+    def _health_activity(
+        self,
+        repo_full_name: str,
+        since_date: datetime,
+        days: int
+    ) -> Dict:
+        """Issue response time, PR merge rate and commit frequency"""
+        data = self._fetch_repo_health_data(repo_full_name, since_date, collect_commit_authors=False)
 
-            # PR merge rate
-            prs = list(repo.get_pulls(state="all"))
-            merge_rate = self._calculate_merge_rate(prs, since_date)
+        # Commit frequency
+        total_commits = data["total_commits"]
+        commit_frequency = total_commits / days if days > 0 else 0
 
-            # Active contributors
-            contributors = self._get_active_contributors(repo, since_date)
+        return {
+            "avg_issue_response_hours": self._calculate_avg_response_time(data["issues"], since_date),
+            "pr_merge_rate": self._calculate_merge_rate(data["prs"], since_date),
+            "commits_per_day": round(commit_frequency, 2),
+            "total_commits": total_commits,
+        }
 
-            # Commit frequency
-            commits = list(repo.get_commits(since=since_date))
-            commit_frequency = len(commits) / days if days > 0 else 0
+    def _health_contributors(
+        self,
+        repo_full_name: str,
+        since_date: datetime
+    ) -> Dict:
+        """Active contributor count and the top 10 by commits"""
+        # One stats request replaces paging through every commit for authors
+        try:
+            contributor_commits = self._get_contributor_stats(repo_full_name, since_date)
+        except Exception:
+            contributor_commits = None
 
-            return {
-                "repo": repo_full_name,
-                "period_days": days,
-                "avg_issue_response_hours": avg_response_time,
-                "pr_merge_rate": merge_rate,
-                "active_contributors": len(contributors),
-                "contributor_list": contributors[:10],
-                "commits_per_day": round(commit_frequency, 2),
-                "total_commits": len(commits),
-                "open_issues": repo.open_issues_count,
-                "stars": repo.stargazers_count,
-                "forks": repo.forks_count,
-            }
-        except Exception as e:
-            return {"error": str(e)}
+        if contributor_commits is None:
+            data = self._fetch_repo_health_data(repo_full_name, since_date, collect_activity=False)
+            contributor_commits = self._count_contributor_commits(data["commit_authors"])
+
+        return {
+            "active_contributors": len(contributor_commits),
+            "contributor_list": self._get_active_contributors(contributor_commits, limit=10),
+        }
 
     def get_watched_repos_activity(
         self,
@@ -82,56 +185,195 @@ class DeveloperDashboard:
         Returns:
             List of activity summaries
         """
-        activities = []
-        since = datetime.now() - timedelta(hours=hours)
-
-        for repo_name in repo_list:
-            try:
-                repo = self.github.get_repo(repo_name)
-
-                # Recent PRs
-                recent_prs = [pr for pr in repo.get_pulls(state="all")
-                             if pr.updated_at >= since]
-
-                # Recent issues
-                recent_issues = [issue for issue in repo.get_issues(state="all")
-                               if issue.updated_at >= since]
-
-                # Recent commits
-                recent_commits = [c for c in repo.get_commits(since=since)]
-
-                activities.append({
-                    "repo": repo_name,
-                    "new_prs": len([pr for pr in recent_prs if pr.created_at >= since]),
-                    "updated_prs": len(recent_prs),
-                    "new_issues": len([issue for issue in recent_issues if issue.created_at >= since]),
-                    "updated_issues": len(recent_issues),
-                    "commits": len(recent_commits),
-                })
-            except Exception as e:
-                activities.append({
-                    "repo": repo_name,
-                    "error": str(e)
-                })
-
-        return activities
+        # PyGithub returns aware UTC datetimes
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+
+        # Repos are independent, I/O-bound lookups: fetch them concurrently,
+        # keeping the result order of repo_list
+        with ThreadPoolExecutor(max_workers=self.ACTIVITY_MAX_WORKERS) as executor:
+            return list(executor.map(
+                lambda repo_name: self._fetch_repo_activity(repo_name, since),
+                repo_list
+            ))
+
+    def _fetch_repo_activity(self, repo_name: str, since: datetime) -> Dict:
+        """Activity summary for one watched repository"""
+        try:
+            repo = gh_cache.get_repo(self.github, repo_name)
+
+            # PRs, issues and commits are separate endpoints; request them in parallel
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                f_prs = executor.submit(self._get_recent_pulls, repo, since)
+                f_issues = executor.submit(lambda: list(repo.get_issues(state="all", since=since)))
+                # totalCount reads the Link rel="last" header: one request, not every page
+                f_commits = executor.submit(lambda: repo.get_commits(since=since).totalCount)
+
+            # Recent PRs
+            recent_prs = f_prs.result()
+
+            # Recent issues (the API filters by updated_at via since)
+            recent_issues = f_issues.result()
+
+            # Recent commits
+            commit_count = f_commits.result()
+
+            return {
+                "repo": repo_name,
+                "new_prs": len([pr for pr in recent_prs if pr.created_at >= since]),
+                "updated_prs": len(recent_prs),
+                "new_issues": len([issue for issue in recent_issues if issue.created_at >= since]),
+                "updated_issues": len(recent_issues),
+                "commits": commit_count,
+            }
+        except Exception as e:
+            return {
+                "repo": repo_name,
+                "error": str(e)
+            }
+
+    @staticmethod
+    def _get_recent_pulls(repo, since: datetime) -> List:
+        """PRs updated since `since`; pages stop at the first older PR"""
+        recent = []
+        for pr in repo.get_pulls(state="all", sort="updated", direction="desc"):
+            if pr.updated_at < since:
+                break
+            recent.append(pr)
+        return recent
+
+    def _fetch_repo_health_data(
+        self,
+        repo_full_name: str,
+        since_date: datetime,
+        collect_activity: bool = True,
+        collect_commit_authors: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Collect open issues active since since_date (each with its first
+        comment, so no per-issue comment requests), recent PRs and commit authors
+        with REPO_HEALTH_QUERY, following cursors only while a connection
+        still has pages in the window. Without collect_activity issues and PRs
+        are skipped; without collect_commit_authors only the first history page
+        is read, for its totalCount.
+        """
+        owner, name = repo_full_name.split("/", 1)
+        since = self._to_github_ts(since_date)
+        variables = {
+            "owner": owner,
+            "name": name,
+            "since": since,
+            "updatedSince": since,
+            "issuesCursor": None,
+            "prsCursor": None,
+            "commitsCursor": None,
+            "withIssues": collect_activity,
+            "withPrs": collect_activity,
+            "withCommits": True,
+        }
+        result: Dict[str, Any] = {"issues": [], "prs": [], "commit_authors": [], "total_commits": 0}
+
+        while variables["withIssues"] or variables["withPrs"] or variables["withCommits"]:
+            repository = github_api.graphql(REPO_HEALTH_QUERY, variables, token=self._token).get("repository")
+            if repository is None:
+                raise ValueError(f"Repository not found: {repo_full_name}")
+
+            if variables["withIssues"]:
+                issues = repository["issues"]
+                result["issues"].extend(issues["nodes"])
+                variables["issuesCursor"] = issues["pageInfo"]["endCursor"]
+                variables["withIssues"] = issues["pageInfo"]["hasNextPage"]
+
+            if variables["withPrs"]:
+                prs = repository["pullRequests"]
+                result["prs"].extend(prs["nodes"])
+                variables["prsCursor"] = prs["pageInfo"]["endCursor"]
+                # Newest first: stop once a page reaches past the window
+                variables["withPrs"] = prs["pageInfo"]["hasNextPage"] and all(
+                    pr["createdAt"] >= since for pr in prs["nodes"]
+                )
+
+            if variables["withCommits"]:
+                target = (repository.get("defaultBranchRef") or {}).get("target") or {}
+                history = target.get("history")
+                if history is None:
+                    # Empty repository: no default branch to walk
+                    variables["withCommits"] = False
+                else:
+                    result["total_commits"] = history["totalCount"]
+                    result["commit_authors"].extend(
+                        ((node.get("author") or {}).get("user") or {}).get("login")
+                        for node in history["nodes"]
+                    )
+                    variables["commitsCursor"] = history["pageInfo"]["endCursor"]
+                    variables["withCommits"] = (
+                        collect_commit_authors and history["pageInfo"]["hasNextPage"]
+                    )
+
+        return result
+
+    def _get_contributor_stats(
+        self,
+        repo_full_name: str,
+        since_date: datetime
+    ) -> Optional[Counter]:
+        """
+        Commits per author since since_date from /stats/contributors (weekly
+        buckets, so the window is rounded out to whole weeks)
+
+        Returns:
+            Counter of login -> commits, or None if GitHub is still computing the stats
+        """
+        url = f"{github_api.API_BASE_URL}/repos/{repo_full_name}/stats/contributors"
+        week_seconds = 7 * 24 * 3600
+        since_ts = since_date.timestamp()
+
+        for attempt in range(self.STATS_RETRIES):
+            resp = github_api.get_session(self._token).get(url, timeout=15)
+            if resp.status_code == 202:
+                time.sleep(self.STATS_RETRY_DELAY * (attempt + 1))
+                continue
+            resp.raise_for_status()
+            if resp.status_code == 204:
+                # Empty repository
+                return Counter()
+
+            contributors = Counter()
+            for entry in resp.json() or []:
+                login = (entry.get("author") or {}).get("login")
+                # Keep every week that overlaps the window
+                commits = sum(week["c"] for week in entry.get("weeks", []) if week["w"] + week_seconds > since_ts)
+                if login and commits:
+                    contributors[login] = commits
+            return contributors
+
+        return None
+
+    @staticmethod
+    def _to_github_ts(value: datetime) -> str:
+        """Format a (local or aware) datetime as a GitHub UTC timestamp"""
+        return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    @staticmethod
+    def _parse_github_ts(value: str) -> datetime:
+        """Parse a GitHub UTC timestamp"""
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
 
     def _calculate_avg_response_time(
         self,
-        issues: List,
+        issues: List[Dict],
         since_date: datetime
     ) -> float:
         """Calculate average issue response time in hours"""
         response_times = []
 
         for issue in issues:
-            if issue.comments > 0:
-                comments = list(issue.get_comments())
-                if comments:
-                    first_response = comments[0].created_at
-                    response_time = (first_response - issue.created_at).total_seconds() / 3600
-                    if response_time > 0:
-                        response_times.append(response_time)
+            comments = issue["comments"]["nodes"]
+            if comments:
+                first_response = self._parse_github_ts(comments[0]["createdAt"])
+                created_at = self._parse_github_ts(issue["createdAt"])
+                response_time = (first_response - created_at).total_seconds() / 3600
+                if response_time > 0:
+                    response_times.append(response_time)
 
         if response_times:
             return round(sum(response_times) / len(response_times), 2)
@@ -139,39 +381,30 @@ class DeveloperDashboard:
 
     def _calculate_merge_rate(
         self,
-        prs: List,
+        prs: List[Dict],
         since_date: datetime
     ) -> float:
         """Calculate PR merge rate percentage"""
-        recent_prs = [pr for pr in prs if pr.created_at >= since_date]
+        since = self._to_github_ts(since_date)
+        recent_prs = [pr for pr in prs if pr["createdAt"] >= since]
         if not recent_prs:
             return 0.0
 
-        merged = sum(1 for pr in recent_prs if pr.state == "merged")
+        merged = sum(1 for pr in recent_prs if pr["merged"])
         return round((merged / len(recent_prs)) * 100, 2)
 
+    def _count_contributor_commits(
+        self,
+        commit_authors: List[Optional[str]]
+    ) -> Counter:
+        """Commit count per author login"""
+        return Counter(author for author in commit_authors if author)
+
     def _get_active_contributors(
         self,
-        repo,
-        since_date: datetime
+        contributor_commits: Counter,
+        limit: Optional[int] = None
     ) -> List[str]:
-        """Get list of active contributors"""
-        contributors = {}
-
-        try:
-            commits = list(repo.get_commits(since=since_date))
-            for commit in commits:
-                author = commit.author
-                if author:
-                    contributors[author.login] = contributors.get(author.login, 0) + 1
-        except:
-            pass
-
-        # Sort by commit count
-        sorted_contributors = sorted(
-            contributors.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-
-        return [name for name, _ in sorted_contributors]
+        """Get active contributors by commit count, optionally only the top `limit`"""
+        # most_common(n) uses a bounded heap rather than sorting every contributor
+        return [name for name, _ in contributor_commits.most_common(limit)]
@@ -0,0 +1,84 @@
+"""
+Short-lived cache for PyGithub repository / issue lookups, plus an ETag cache
+for conditional REST requests
+"""
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from src.utils import github_api
+from src.utils.ttl_cache import TTLCache
+
+# Objects fetched within this window are reused instead of re-requested
+GH_CACHE_TTL = 60  # seconds
+
+_CACHE = TTLCache(maxsize=1024, ttl=GH_CACHE_TTL)
+
+
+def _cached(github, key: Hashable, fetch: Callable[[], Any]) -> Any:
+    """
+    Return the cached result of fetch() for (github client, key).
+
+    Entries are scoped to the client instance, so lookups made with different
+    tokens never share results. The client is stored alongside the value,
+    which keeps its id() from being reused while the entry is alive.
+    """
+    full_key = (id(github),) + key
+    hit = _CACHE.get(full_key)
+    if hit is not None and hit[0] is github:
+        return hit[1]
+    value = fetch()
+    _CACHE.set(full_key, (github, value))
+    return value
+
+
+def get_repo(github, repo_full_name: str):
+    """Cached github.get_repo(repo_full_name)"""
+    return _cached(github, ("repo", repo_full_name), lambda: github.get_repo(repo_full_name))
+
+
+def get_issue(github, repo, number: int):
+    """Cached repo.get_issue(number) for a repo obtained from the same client"""
+    return _cached(github, ("issue", repo.full_name, number), lambda: repo.get_issue(number))
+
+
+# Conditional requests: (token, url, params) -> (etag, body). A 304 answer to
+# If-None-Match doesn't count against the primary rate limit, so revalidating
+# unchanged data is free; entries only expire to bound memory.
+ETAG_CACHE_TTL = 24 * 3600  # seconds
+
+_ETAG_CACHE = TTLCache(maxsize=1024, ttl=ETAG_CACHE_TTL)
+
+
+def cached_get(
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    token: Optional[str] = None,
+    timeout: int = 15
+) -> Any:
+    """
+    GET a REST API path (e.g. "/repos/owner/repo") and return its JSON body,
+    revalidating a previously seen response with If-None-Match
+
+    Raises:
+        requests.HTTPError: on non-2xx / non-304 responses
+    """
+    url = f"{github_api.API_BASE_URL}{path}"
+    key = (token, url, tuple(sorted((params or {}).items())))
+    cached = _ETAG_CACHE.get(key)
+
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    resp = github_api.get_session(token).get(url, params=params, headers=headers, timeout=timeout)
+    if resp.status_code == 304 and cached:
+        return cached[1]
+    resp.raise_for_status()
+
+    body = resp.json()
+    etag = resp.headers.get("ETag")
+    if etag:
+        _ETAG_CACHE.set(key, (etag, body))
+    return body
+
+
+def clear() -> None:
+    """Drop every cached lookup"""
+    _CACHE.clear()
+    _ETAG_CACHE.clear()
@@ -0,0 +1,144 @@
+"""
+Direct GitHub HTTP helpers (GraphQL / raw REST) for paths that bypass PyGithub
+"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import Config
+
+API_BASE_URL = Config.GITHUB_API_BASE_URL.rstrip("/")
+GRAPHQL_URL = f"{API_BASE_URL}/graphql"
+
+
+class RateLimitRetry(Retry):
+    """
+    urllib3 Retry for GitHub: backs off on 429/5xx and on 403 responses that
+    carry Retry-After (secondary rate limit). Other 403s (permissions, primary
+    limit exhausted until reset) are returned immediately.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code == 403 and not has_retry_after:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+# Connection pool sizing: room for the thread pools that share a session
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+
+
+def mount_retries(session: requests.Session) -> requests.Session:
+    """Mount a pooled, exponential-backoff, Retry-After-aware adapter for https:// on the session"""
+    retry = RateLimitRetry(
+        total=5,
+        backoff_factor=1.5,
+        status_forcelist=[403, 429, 502, 503, 504],
+        allowed_methods=["GET", "POST"],
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    session.mount("https://", HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=retry,
+    ))
+    return session
+
+
+# One pooled session per token, so repeated calls reuse the TCP/TLS connection
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(token: Optional[str] = None) -> requests.Session:
+    """Return a shared requests.Session authorized with the given (or configured) token"""
+    token = token or Config.GITHUB_TOKEN
+    with _sessions_lock:
+        session = _sessions.get(token)
+        if session is None:
+            session = mount_retries(requests.Session())
+            session.headers.update({
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            })
+            if token:
+                session.headers["Authorization"] = f"Bearer {token}"
+            _sessions[token] = session
+        return session
+
+
+def graphql_partial(
+    query: str,
+    variables: Optional[Dict[str, Any]] = None,
+    token: Optional[str] = None,
+    timeout: int = 30
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Run a GitHub GraphQL query and return (data, errors) without raising on
+    GraphQL errors. Aliased batches use this: one failing alias is reported in
+    errors (with its alias as path[0]) while the others still succeed.
+
+    Raises:
+        requests.HTTPError: on non-2xx responses
+    """
+    resp = get_session(token).post(
+        GRAPHQL_URL,
+        json={"query": query, "variables": variables or {}},
+        timeout=timeout,
+    )
+    resp.raise_for_status()
+    payload = resp.json()
+    return payload.get("data") or {}, payload.get("errors") or []
+
+
+def graphql(
+    query: str,
+    variables: Optional[Dict[str, Any]] = None,
+    token: Optional[str] = None,
+    timeout: int = 30
+) -> Dict[str, Any]:
+    """
+    Run a GitHub GraphQL query and return its "data" dict
+
+    Raises:
+        RuntimeError: if GitHub reports GraphQL errors
+        requests.HTTPError: on non-2xx responses
+    """
+    data, errors = graphql_partial(query, variables, token=token, timeout=timeout)
+    if errors:
+        messages = "; ".join(e.get("message", "") for e in errors)
+        raise RuntimeError(f"GitHub GraphQL error: {messages}")
+    return data
+
+
+def count_items(
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    token: Optional[str] = None,
+    timeout: int = 15
+) -> int:
+    """
+    Count the items of a paginated REST list endpoint with a single request
+
+    Requests one item per page and reads the page number of the
+    Link rel="last" URL, instead of downloading every page.
+
+    Args:
+        path: API path, e.g. "/repos/owner/repo/commits"
+        params: Extra query parameters (e.g. {"since": "..."})
+    """
+    resp = get_session(token).get(
+        f"{API_BASE_URL}{path}",
+        params={**(params or {}), "per_page": 1},
+        timeout=timeout,
+    )
+    resp.raise_for_status()
+    last_url = resp.links.get("last", {}).get("url")
+    if last_url:
+        return int(parse_qs(urlparse(last_url).query)["page"][0])
+    return len(resp.json())
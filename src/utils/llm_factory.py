@@ -9,18 +9,276 @@ Supports:
 - Built-in providers via registry (deepseek, openai, anthropic, google, azure, ollama, groq).
 - openai_compatible: any OpenAI-compatible API (base_url + api_key + model_name).
 - Custom providers via LLMFactory.register(name, creator_fn).
+
+create_llm / acreate_llm / create_streaming_llm / create_resilient_llm /
+create_routed_llm / create_coalescing_llm are also exported as module-level
+functions, along with per-provider shortcuts such as create_deepseek_llm.
 """
+import asyncio
+import atexit
+import bisect
+import hashlib
+import importlib
+import importlib.util
+import itertools
 import os
-from typing import Optional, Any, Dict, Callable
-from langchain_core.language_models import BaseChatModel
 import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent.parent))
+import threading
+import weakref
+from concurrent.futures import Future
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Optional, Any, AsyncIterator, ClassVar, Dict, Callable, Iterator, List, Mapping, Sequence, Tuple, Union
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.load import dumps
+from langchain_core.runnables import Runnable, RunnableConfig
 from config import Config
+from src.utils.logger import get_logger
+from src.utils.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
 
 # Type for provider creator: (model_name, temperature, **kwargs) -> BaseChatModel
 _CreatorFn = Callable[..., BaseChatModel]
 
+# One keep-alive httpx pool shared by every OpenAI-SDK based client, so new
+# LLM instances reuse warm connections instead of paying a TLS handshake each.
+# Async pools belong to the event loop that opened them, so they are never
+# process-wide: acreate_llm attaches one client per running loop instead.
+_HTTP_CLIENT = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def _get_http_client():
+    """Shared httpx.Client (HTTP/2 when the h2 package is installed), created on first use"""
+    global _HTTP_CLIENT
+    with _HTTP_CLIENT_LOCK:
+        if _HTTP_CLIENT is None:
+            import httpx  # installed with the openai SDK
+
+            _HTTP_CLIENT = httpx.Client(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+                timeout=httpx.Timeout(60.0),
+            )
+            atexit.register(_HTTP_CLIENT.close)
+        return _HTTP_CLIENT
+
+
+# Event loop -> httpx.AsyncClient bound to it, for acreate_llm
+_LOOP_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+
+def _get_loop_async_http_client():
+    """httpx.AsyncClient for the running event loop, created on first use in that loop"""
+    loop = asyncio.get_running_loop()
+    with _HTTP_CLIENT_LOCK:
+        client = _LOOP_ASYNC_CLIENTS.get(loop)
+        if client is None:
+            import httpx
+
+            client = httpx.AsyncClient(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+                timeout=httpx.Timeout(60.0, connect=5.0),
+            )
+            _LOOP_ASYNC_CLIENTS[loop] = client
+        return client
+
+
+@lru_cache(maxsize=None)
+def _load_chat_model(module: str, class_name: str, package: str):
+    """
+    Import a provider's chat model class on first use and keep it, so repeated
+    create_llm calls skip the import machinery and unused providers are never loaded.
+    """
+    try:
+        return getattr(importlib.import_module(module), class_name)
+    except ImportError:
+        raise ImportError(
+            f"{package} is not installed. "
+            f"Install it with: pip install {package}"
+        )
+
+
+# provider -> (module, chat model class, pip package)
+_PROVIDER_CLASSES: Dict[str, Tuple[str, str, str]] = {
+    "deepseek": ("langchain_openai", "ChatOpenAI", "langchain-openai"),
+    "openai": ("langchain_openai", "ChatOpenAI", "langchain-openai"),
+    "anthropic": ("langchain_anthropic", "ChatAnthropic", "langchain-anthropic"),
+    "google": ("langchain_google_genai", "ChatGoogleGenerativeAI", "langchain-google-genai"),
+    "azure": ("langchain_openai", "AzureChatOpenAI", "langchain-openai"),
+    "ollama": ("langchain_ollama", "ChatOllama", "langchain-ollama"),
+    "groq": ("langchain_groq", "ChatGroq", "langchain-groq"),
+    "openai_compatible": ("langchain_openai", "ChatOpenAI", "langchain-openai"),
+}
+
+
+def _get_provider_class(provider: str):
+    """Chat model class of a built-in provider, imported once on first use"""
+    return _load_chat_model(*_PROVIDER_CLASSES[provider])
+
+
+# provider -> (module, exception classes) for transient failures worth retrying:
+# rate limits, timeouts, connection errors and 5xx responses
+_OPENAI_SDK_ERRORS = ("RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError")
+_RETRYABLE_ERRORS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "deepseek": ("openai", _OPENAI_SDK_ERRORS),
+    "openai": ("openai", _OPENAI_SDK_ERRORS),
+    "azure": ("openai", _OPENAI_SDK_ERRORS),
+    "openai_compatible": ("openai", _OPENAI_SDK_ERRORS),
+    "anthropic": ("anthropic", _OPENAI_SDK_ERRORS),
+    "groq": ("groq", _OPENAI_SDK_ERRORS),
+    "google": (
+        "google.api_core.exceptions",
+        ("ResourceExhausted", "ServiceUnavailable", "DeadlineExceeded", "InternalServerError"),
+    ),
+    "ollama": ("httpx", ("TransportError",)),
+}
+
+# Providers whose chat model retries internally through a max_retries field
+_SDK_RETRY_PROVIDERS = frozenset({
+    "deepseek", "openai", "azure", "openai_compatible", "anthropic", "groq", "google",
+})
+
+
+@lru_cache(maxsize=None)
+def _retryable_errors(provider: str) -> Tuple[type, ...]:
+    """Transient exception types of a provider's SDK (builtin network errors as a floor)"""
+    errors: List[type] = [ConnectionError, TimeoutError]
+    module_name, class_names = _RETRYABLE_ERRORS.get(provider, ("", ()))
+    if module_name:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            module = None
+        errors.extend(getattr(module, name) for name in class_names if hasattr(module, name))
+    return tuple(errors)
+
+
+def _openai_http_kwargs(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Shared sync http_client for ChatOpenAI / AzureChatOpenAI, unless the caller
+    passed its own. http_async_client is left to the caller (acreate_llm) or the
+    SDK default: cached instances outlive event loops, so a shared async pool
+    would end up reused from a closed loop.
+    """
+    if "http_client" in kwargs:
+        return {}
+    return {"http_client": _get_http_client()}
+
+
+class _RoundRobinRunnable(Runnable):
+    """Dispatch each call to the next runnable in turn (thread-safe rotation)"""
+
+    def __init__(self, runnables: Sequence[Runnable]):
+        self._cycle = itertools.cycle(runnables)
+        self._lock = threading.Lock()
+
+    def _next(self) -> Runnable:
+        with self._lock:
+            return next(self._cycle)
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        return self._next().invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        return await self._next().ainvoke(input, config, **kwargs)
+
+    def stream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Iterator[Any]:
+        yield from self._next().stream(input, config, **kwargs)
+
+    async def astream(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        async for chunk in self._next().astream(input, config, **kwargs):
+            yield chunk
+
+
+class _CoalescingRunnable(Runnable):
+    """
+    Wrap a chat model so identical requests (same messages and call kwargs)
+    share one provider call: a request already in flight is awaited instead
+    of re-sent, and completed responses are served from a TTL cache.
+    Callers receiving a shared response must not mutate it.
+    """
+
+    def __init__(self, llm: BaseChatModel, cache_size: int, cache_ttl: float):
+        self._llm = llm
+        self._responses = TTLCache(maxsize=cache_size, ttl=cache_ttl) if cache_size else None
+        self._inflight: Dict[bytes, Future] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, input: LanguageModelInput, kwargs: Dict[str, Any]) -> bytes:
+        messages = self._llm._convert_input(input).to_messages()
+        payload = dumps({"messages": messages, "kwargs": kwargs}, sort_keys=True)
+        return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+    def _claim(self, key: bytes) -> Tuple[Future, bool]:
+        """Future for key, and whether this caller owns the request"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = self._inflight[key] = Future()
+            return future, True
+
+    def _settle(self, key: bytes, future: Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+        # Cache before leaving the in-flight map, so no window serves neither
+        if error is None and self._responses is not None:
+            self._responses.set(key, result)
+        with self._lock:
+            del self._inflight[key]
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def invoke(self, input: LanguageModelInput, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        key = self._key(input, kwargs)
+        if self._responses is not None:
+            hit = self._responses.get(key)
+            if hit is not None:
+                return hit
+        future, owner = self._claim(key)
+        if not owner:
+            return future.result()
+        try:
+            result = self._llm.invoke(input, config, **kwargs)
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result=result)
+        return result
+
+    async def ainvoke(self, input: LanguageModelInput, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        key = self._key(input, kwargs)
+        if self._responses is not None:
+            hit = self._responses.get(key)
+            if hit is not None:
+                return hit
+        future, owner = self._claim(key)
+        if not owner:
+            return await asyncio.wrap_future(future)
+        try:
+            result = await self._llm.ainvoke(input, config, **kwargs)
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result=result)
+        return result
+
+    # Streams are consumed incrementally by one caller, so they are not shared
+    def stream(self, input: LanguageModelInput, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Iterator[Any]:
+        yield from self._llm.stream(input, config, **kwargs)
+
+    async def astream(
+        self, input: LanguageModelInput, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        async for chunk in self._llm.astream(input, config, **kwargs):
+            yield chunk
+
 
 class LLMFactory:
     """
@@ -40,57 +298,90 @@ class LLMFactory:
         )
     """
 
-    # Provider configuration (default models, env hints; registry holds creators)
-    PROVIDER_CONFIGS: Dict[str, Dict[str, Any]] = {
-        "deepseek": {
+    # Provider configuration (default models, env hints; registry holds creators).
+    # Read-only: safe to share across threads without copying.
+    PROVIDER_CONFIGS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+        "deepseek": MappingProxyType({
             "default_model": "deepseek-chat",
             "api_key_env": "DEEPSEEK_API_KEY",
             "package": "langchain-openai",
-        },
-        "openai": {
+        }),
+        "openai": MappingProxyType({
             "default_model": "gpt-4-turbo-preview",
             "api_key_env": "OPENAI_API_KEY",
             "package": "langchain-openai",
-        },
-        "anthropic": {
+        }),
+        "anthropic": MappingProxyType({
             "default_model": "claude-3-opus-20240229",
             "api_key_env": "ANTHROPIC_API_KEY",
             "package": "langchain-anthropic",
-        },
-        "google": {
+        }),
+        "google": MappingProxyType({
             "default_model": "gemini-pro",
             "api_key_env": "GOOGLE_API_KEY",
             "package": "langchain-google-genai",
-        },
-        "azure": {
+        }),
+        "azure": MappingProxyType({
             "default_model": "gpt-4",
             "api_key_env": "AZURE_OPENAI_API_KEY",
             "package": "langchain-openai",
-        },
-        "ollama": {
+        }),
+        "ollama": MappingProxyType({
             "default_model": "llama2",
             "api_key_env": None,
             "package": "langchain-ollama",
-        },
-        "groq": {
+        }),
+        "groq": MappingProxyType({
             "default_model": "mixtral-8x7b-32768",
             "api_key_env": "GROQ_API_KEY",
             "package": "langchain-groq",
-        },
-        "openai_compatible": {
+        }),
+        "openai_compatible": MappingProxyType({
             "default_model": "",  # caller must pass model_name or kwargs["model"]
             "api_key_env": None,
             "package": "langchain-openai",
-        },
+        }),
+    })
+
+    # provider -> default model name, so create_llm resolves it with one lookup
+    _DEFAULT_MODELS: Dict[str, str] = {
+        name: config["default_model"] for name, config in PROVIDER_CONFIGS.items()
     }
 
+    # kwargs consumed by the creators themselves, never forwarded to the model
+    _KEY_EXCLUDE = frozenset({"api_key"})
+    _URL_KEY_EXCLUDE = frozenset({"api_key", "base_url"})
+    _AZURE_EXCLUDE = frozenset({"api_key", "endpoint", "api_version"})
+    _OLLAMA_EXCLUDE = frozenset({"base_url"})
+    _COMPATIBLE_EXCLUDE = frozenset({"base_url", "api_key", "model", "model_name"})
+
     # Registry: provider_name -> creator(model_name, temperature, **kwargs) -> BaseChatModel
-    _CREATORS: Dict[str, _CreatorFn] = {}
+    _CREATORS: ClassVar[Dict[str, _CreatorFn]] = {}
+
+    # Sorted provider names and their display string, maintained by register()
+    _SORTED_PROVIDERS: List[str] = []
+    _SUPPORTED_STR: str = ""
 
     @classmethod
     def register(cls, name: str, creator: _CreatorFn) -> None:
         """Register a provider. name is case-insensitive (stored lower)."""
-        cls._CREATORS[name.lower()] = creator
+        name = name.lower()
+        if name not in cls._CREATORS:
+            bisect.insort(cls._SORTED_PROVIDERS, name)
+            cls._SUPPORTED_STR = ", ".join(cls._SORTED_PROVIDERS)
+        cls._CREATORS[name] = creator
+        # Instances built by a replaced creator must not be served any more
+        cls.clear_cache()
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Forget every cached LLM instance (the next create_llm builds fresh ones)"""
+        _create_cached.cache_clear()
+
+    @staticmethod
+    def cache_info():
+        """Hit/miss statistics of the create_llm instance cache"""
+        return _create_cached.cache_info()
 
     @classmethod
     def create_llm(
@@ -98,6 +389,7 @@ class LLMFactory:
         provider: str = "openai",
         model_name: Optional[str] = None,
         temperature: float = 0.3,
+        cache: bool = True,
         **kwargs
     ) -> BaseChatModel:
         """
@@ -108,32 +400,300 @@ class LLMFactory:
         for any OpenAI-compatible API (pass base_url, api_key, model_name in kwargs).
         Add custom providers with LLMFactory.register(name, creator_fn).
 
+        Instances are cached by configuration: identical (provider, model_name,
+        temperature, kwargs) calls return the same shared client. Pass
+        cache=False to get a private instance (e.g. if you will mutate it).
+        Calls with unhashable kwargs are never cached.
+
         Args:
             provider: LLM provider name (case-insensitive)
             model_name: Model name (optional; uses provider default when available)
             temperature: Model temperature
+            cache: Reuse an identical previously created instance
             **kwargs: Provider-specific (e.g. api_key, base_url for openai_compatible)
 
         Returns:
             BaseChatModel instance
         """
-        provider = provider.lower()
-
-        if provider not in cls._CREATORS:
-            supported = ", ".join(sorted(cls._CREATORS.keys()))
+        creator = cls._CREATORS.get(provider)
+        if creator is None:
+            # Registered names are lowercase: only fold case on a miss, and
+            # intern the result so later lookups compare by identity
+            provider = sys.intern(provider.lower())
+            creator = cls._CREATORS.get(provider)
+        if creator is None:
             raise ValueError(
                 f"Unsupported provider: {provider}. "
-                f"Registered providers: {supported}. "
+                f"Registered providers: {cls._SUPPORTED_STR}. "
                 "Use provider='openai_compatible' with base_url, api_key, model_name for custom APIs."
             )
 
         # Default model from config when not specified
-        if not model_name and provider in cls.PROVIDER_CONFIGS:
-            model_name = cls.PROVIDER_CONFIGS[provider].get("default_model") or None
+        if not model_name:
+            model_name = cls._DEFAULT_MODELS.get(provider) or None
+
+        if cache:
+            kwargs_key = tuple(sorted(kwargs.items()))
+            try:
+                hash(kwargs_key)
+            except TypeError:
+                pass
+            else:
+                return _create_cached(provider, model_name, temperature, kwargs_key)
 
-        creator = cls._CREATORS[provider]
         return creator(model_name, temperature, **kwargs)
 
+    # Providers built on the OpenAI SDK, which accept http_async_client
+    _OPENAI_FAMILY = frozenset({"deepseek", "openai", "azure", "openai_compatible"})
+
+    @classmethod
+    async def acreate_llm(
+        cls,
+        provider: str = "openai",
+        model_name: Optional[str] = None,
+        temperature: float = 0.3,
+        **kwargs
+    ) -> BaseChatModel:
+        """
+        create_llm for async callers.
+
+        Construction (including the provider package import on first use) runs
+        in a worker thread, so the event loop is not blocked. OpenAI-family
+        models get an httpx.AsyncClient owned by the running loop, so
+        asyncio.gather(*(llm.ainvoke(p) for p in prompts)) shares keep-alive
+        connections that are valid in that loop. Pass http_async_client to
+        use your own client instead.
+        """
+        if provider.lower() in cls._OPENAI_FAMILY and "http_async_client" not in kwargs:
+            kwargs["http_async_client"] = _get_loop_async_http_client()
+        return await asyncio.to_thread(
+            cls.create_llm, provider, model_name=model_name, temperature=temperature, **kwargs
+        )
+
+    # Providers whose chat model takes a `streaming` constructor flag
+    _STREAMING_FLAG_PROVIDERS = frozenset({
+        "deepseek", "openai", "azure", "openai_compatible", "anthropic", "groq",
+    })
+
+    @classmethod
+    def create_streaming_llm(
+        cls,
+        provider: str = "openai",
+        model_name: Optional[str] = None,
+        temperature: float = 0.3,
+        callback_handler: Optional[BaseCallbackHandler] = None,
+        **kwargs
+    ) -> BaseChatModel:
+        """
+        Create an LLM that streams tokens as they are generated, so callers see
+        the first token instead of waiting for the whole response. Consume it
+        with llm.stream(...) / llm.astream(...), or pass a callback_handler
+        (e.g. AsyncIteratorCallbackHandler) to receive tokens as callbacks.
+
+        Providers without a streaming flag still stream through stream()/astream().
+        """
+        if provider.lower() in cls._STREAMING_FLAG_PROVIDERS:
+            kwargs.setdefault("streaming", True)
+        if callback_handler is not None:
+            # A handler is per-consumer state, so this instance is never shared
+            kwargs["callbacks"] = [callback_handler]
+            kwargs["cache"] = False
+        return cls.create_llm(provider, model_name=model_name, temperature=temperature, **kwargs)
+
+    @classmethod
+    def create_resilient_llm(
+        cls,
+        provider: str = "openai",
+        model_name: Optional[str] = None,
+        temperature: float = 0.3,
+        max_retries: int = 5,
+        max_concurrency: int = 10,
+        retry_on: Optional[Tuple[type, ...]] = None,
+        **kwargs
+    ) -> Runnable:
+        """
+        Create an LLM wrapped with retries and a concurrency cap.
+
+        Transient failures (rate limits, timeouts, connection errors, 5xx) are
+        retried up to max_retries attempts with jittered exponential backoff,
+        so callers need no retry loop of their own and retries from concurrent
+        calls don't arrive in lockstep. Other errors (bad key, context length,
+        validation) are raised immediately. batch()/abatch() run at most
+        max_concurrency requests at once.
+
+        The provider SDK's own retries are disabled (max_retries=0 on the model,
+        unless passed in kwargs), so one call makes at most max_retries attempts.
+
+        Args:
+            retry_on: Exception types to retry; defaults to the provider's
+                transient error classes (ConnectionError / TimeoutError for
+                custom providers)
+
+        Returns a Runnable with the same invoke/stream/batch interface as the
+        underlying chat model.
+        """
+        provider = provider.lower()
+        if provider in _SDK_RETRY_PROVIDERS:
+            kwargs.setdefault("max_retries", 0)
+        llm = cls.create_llm(provider, model_name=model_name, temperature=temperature, **kwargs)
+        return llm.with_retry(
+            retry_if_exception_type=retry_on or _retryable_errors(provider),
+            stop_after_attempt=max_retries,
+            wait_exponential_jitter=True,
+        ).with_config({"max_concurrency": max_concurrency})
+
+    @classmethod
+    def create_routed_llm(
+        cls,
+        providers: Sequence[Union[str, Dict[str, Any]]],
+        strategy: str = "fallback",
+        temperature: float = 0.3
+    ) -> Runnable:
+        """
+        Create one LLM backed by several providers.
+
+        Strategies:
+            fallback: always call the first provider; on error, try the next ones in order
+            round_robin: rotate the first provider per call (spreading load and
+                rate limits across providers), still falling back to the others on error
+
+        Args:
+            providers: Provider names, or create_llm kwargs dicts with a
+                "provider" key (e.g. {"provider": "azure", "model_name": "gpt-4"})
+            strategy: "fallback" or "round_robin"
+            temperature: Default temperature for entries that don't set one
+        """
+        if not providers:
+            raise ValueError("create_routed_llm needs at least one provider")
+        if strategy not in ("fallback", "round_robin"):
+            raise ValueError(f"Unsupported routing strategy: {strategy}. Use 'fallback' or 'round_robin'.")
+
+        models = []
+        for spec in providers:
+            options = {"provider": spec} if isinstance(spec, str) else dict(spec)
+            options.setdefault("temperature", temperature)
+            models.append(cls.create_llm(**options))
+
+        if len(models) == 1:
+            return models[0]
+        if strategy == "fallback":
+            return models[0].with_fallbacks(models[1:])
+        return _RoundRobinRunnable([
+            models[i].with_fallbacks(models[i + 1:] + models[:i]) for i in range(len(models))
+        ])
+
+    @classmethod
+    def create_coalescing_llm(
+        cls,
+        provider: str = "openai",
+        model_name: Optional[str] = None,
+        temperature: float = 0.3,
+        cache_size: int = 1024,
+        cache_ttl: float = 600.0,
+        **kwargs
+    ) -> Runnable:
+        """
+        Create an LLM that deduplicates identical prompts: concurrent identical
+        requests (e.g. a shared system prompt in a map step, or batch() over
+        repeated inputs) go out once, and repeats within cache_ttl seconds are
+        answered from memory. Pass cache_size=0 to only coalesce in-flight calls.
+
+        Deduplication is scoped to the returned object, so share it between
+        the callers that should coalesce. Best suited to temperature=0, where
+        a repeated prompt is expected to give the same answer anyway.
+        """
+        llm = cls.create_llm(provider, model_name=model_name, temperature=temperature, **kwargs)
+        return _CoalescingRunnable(llm, cache_size, cache_ttl)
+
+    @classmethod
+    def warmup(cls, providers: Optional[Sequence[str]] = None, prime: bool = False) -> Dict[str, str]:
+        """
+        Pay cold-start costs up front (e.g. at app startup) instead of on the
+        first request: import each provider's package and, for OpenAI-family
+        providers, open the shared HTTP connection pool. With prime=True a
+        short "ping" request is also sent, which completes the TLS handshake and
+        (for Ollama) loads the model weights.
+
+        Args:
+            providers: Provider names (default: every built-in provider)
+            prime: Also send one short request per provider
+
+        Returns:
+            provider -> error message for providers that failed to warm up
+            (e.g. package not installed, missing API key); empty when all succeeded
+        """
+        errors: Dict[str, str] = {}
+        for provider in providers if providers is not None else _PROVIDER_CLASSES:
+            provider = provider.lower()
+            try:
+                if provider in _PROVIDER_CLASSES:
+                    _get_provider_class(provider)
+                if provider in cls._OPENAI_FAMILY:
+                    _get_http_client()
+                if prime:
+                    cls.create_llm(provider).invoke("ping")
+            except Exception as e:
+                errors[provider] = str(e)
+        return errors
+
+    @staticmethod
+    def batch_invoke(
+        llm: BaseChatModel,
+        prompts: Sequence[LanguageModelInput],
+        max_concurrency: int = 10,
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Invoke llm on many prompts concurrently (at most max_concurrency in
+        flight), so wall time follows the slowest request rather than the sum.
+        Results are in prompt order; with return_exceptions, failures are
+        returned in place instead of raised.
+        """
+        return llm.batch(
+            list(prompts),
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=return_exceptions,
+        )
+
+    @staticmethod
+    async def abatch(
+        llm: BaseChatModel,
+        prompts: Sequence[LanguageModelInput],
+        max_concurrency: int = 10,
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """Async batch_invoke for callers already running in an event loop"""
+        return await llm.abatch(
+            list(prompts),
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=return_exceptions,
+        )
+
+    @staticmethod
+    def _build_openai_family(
+        provider: str,
+        model: str,
+        temperature: float,
+        api_key: str,
+        kwargs: Dict[str, Any],
+        exclude: frozenset,
+        **fields
+    ) -> BaseChatModel:
+        """
+        Shared constructor for the OpenAI-SDK based providers (deepseek, openai,
+        azure, openai_compatible): resolves the provider's chat class, attaches
+        the shared HTTP pool and forwards every kwarg not in exclude.
+        """
+        chat_class = _get_provider_class(provider)
+        return chat_class(
+            model=model,
+            temperature=temperature,
+            api_key=api_key,
+            **fields,
+            **_openai_http_kwargs(kwargs),
+            **{k: kwargs[k] for k in kwargs.keys() - exclude}
+        )
+
     @staticmethod
     def _create_deepseek(
         model_name: Optional[str],
@@ -141,20 +701,16 @@ class LLMFactory:
         **kwargs
     ) -> BaseChatModel:
         """Create DeepSeek LLM (OpenAI-compatible API)"""
-        from langchain_openai import ChatOpenAI
-
-        api_key = kwargs.get("api_key") or Config.DEEPSEEK_API_KEY
-        base_url = kwargs.get("base_url") or Config.DEEPSEEK_BASE_URL
+        api_key = kwargs.get("api_key") or _RESOLVED["deepseek"]["api_key"]
+        base_url = kwargs.get("base_url") or _RESOLVED["deepseek"]["base_url"]
 
         if not api_key:
             raise ValueError("DEEPSEEK_API_KEY is required for DeepSeek provider")
 
-        return ChatOpenAI(
-            model=model_name or "deepseek-chat",
-            temperature=temperature,
-            api_key=api_key,
+        return LLMFactory._build_openai_family(
+            "deepseek", model_name or "deepseek-chat", temperature, api_key,
+            kwargs, LLMFactory._URL_KEY_EXCLUDE,
             base_url=base_url,
-            **{k: v for k, v in kwargs.items() if k not in ["api_key", "base_url"]}
         )
 
     @staticmethod
@@ -164,17 +720,13 @@ class LLMFactory:
         **kwargs
     ) -> BaseChatModel:
         """Create OpenAI LLM"""
-        from langchain_openai import ChatOpenAI
-
-        api_key = kwargs.get("api_key") or Config.OPENAI_API_KEY
+        api_key = kwargs.get("api_key") or _RESOLVED["openai"]["api_key"]
         if not api_key:
             raise ValueError("OPENAI_API_KEY is required for OpenAI provider")
 
-        return ChatOpenAI(
-            model=model_name or "gpt-4-turbo-preview",
-            temperature=temperature,
-            api_key=api_key,
-            **{k: v for k, v in kwargs.items() if k != "api_key"}
+        return LLMFactory._build_openai_family(
+            "openai", model_name or "gpt-4-turbo-preview", temperature, api_key,
+            kwargs, LLMFactory._KEY_EXCLUDE,
         )
 
     @staticmethod
@@ -184,15 +736,9 @@ class LLMFactory:
         **kwargs
     ) -> BaseChatModel:
         """Create Anthropic Claude LLM"""
-        try:
-            from langchain_anthropic import ChatAnthropic
-        except ImportError:
-            raise ImportError(
-                "langchain-anthropic is not installed. "
-                "Install it with: pip install langchain-anthropic"
-            )
+        ChatAnthropic = _get_provider_class("anthropic")
 
-        api_key = kwargs.get("api_key") or os.getenv("ANTHROPIC_API_KEY")
+        api_key = kwargs.get("api_key") or _RESOLVED["anthropic"]["api_key"]
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY is required for Anthropic provider")
 
@@ -200,7 +746,7 @@ class LLMFactory:
             model=model_name or "claude-3-opus-20240229",
             temperature=temperature,
             api_key=api_key,
-            **{k: v for k, v in kwargs.items() if k != "api_key"}
+            **{k: kwargs[k] for k in kwargs.keys() - LLMFactory._KEY_EXCLUDE}
         )
 
     @staticmethod
@@ -210,15 +756,9 @@ class LLMFactory:
         **kwargs
     ) -> BaseChatModel:
         """Create Google Gemini LLM"""
-        try:
-            from langchain_google_genai import ChatGoogleGenerativeAI
-        except ImportError:
-            raise ImportError(
-                "langchain-google-genai is not installed. "
-                "Install it with: pip install langchain-google-genai"
-            )
+        ChatGoogleGenerativeAI = _get_provider_class("google")
 
-        api_key = kwargs.get("api_key") or os.getenv("GOOGLE_API_KEY")
+        api_key = kwargs.get("api_key") or _RESOLVED["google"]["api_key"]
         if not api_key:
             raise ValueError("GOOGLE_API_KEY is required for Google provider")
 
@@ -226,7 +766,7 @@ class LLMFactory:
             model=model_name or "gemini-pro",
             temperature=temperature,
             google_api_key=api_key,
-            **{k: v for k, v in kwargs.items() if k != "api_key"}
+            **{k: kwargs[k] for k in kwargs.keys() - LLMFactory._KEY_EXCLUDE}
         )
 
     @staticmethod
@@ -236,23 +776,19 @@ class LLMFactory:
         **kwargs
     ) -> BaseChatModel:
         """Create Azure OpenAI LLM"""
-        from langchain_openai import AzureChatOpenAI
-
-        api_key = kwargs.get("api_key") or os.getenv("AZURE_OPENAI_API_KEY")
-        endpoint = kwargs.get("endpoint") or os.getenv("AZURE_OPENAI_ENDPOINT")
+        api_key = kwargs.get("api_key") or _RESOLVED["azure"]["api_key"]
+        endpoint = kwargs.get("endpoint") or _RESOLVED["azure"]["endpoint"]
 
         if not api_key:
             raise ValueError("AZURE_OPENAI_API_KEY is required for Azure provider")
         if not endpoint:
             raise ValueError("AZURE_OPENAI_ENDPOINT is required for Azure provider")
 
-        return AzureChatOpenAI(
-            model=model_name or "gpt-4",
-            temperature=temperature,
+        return LLMFactory._build_openai_family(
+            "azure", model_name or "gpt-4", temperature, api_key,
+            kwargs, LLMFactory._AZURE_EXCLUDE,
             azure_endpoint=endpoint,
-            api_key=api_key,
             api_version=kwargs.get("api_version", "2024-02-15-preview"),
-            **{k: v for k, v in kwargs.items() if k not in ["api_key", "endpoint", "api_version"]}
         )
 
     @staticmethod
@@ -261,22 +797,29 @@ class LLMFactory:
         temperature: float,
         **kwargs
     ) -> BaseChatModel:
-        """Create Ollama LLM (local models)"""
-        try:
-            from langchain_ollama import ChatOllama
-        except ImportError:
-            raise ImportError(
-                "langchain-ollama is not installed. "
-                "Install it with: pip install langchain-ollama"
-            )
+        """
+        Create Ollama LLM (local models)
+
+        Tuning kwargs (or env vars): num_ctx (OLLAMA_NUM_CTX), num_predict
+        (OLLAMA_NUM_PREDICT), num_thread (OLLAMA_NUM_THREAD), num_gpu
+        (OLLAMA_NUM_GPU), keep_alive (OLLAMA_KEEP_ALIVE). Server-side request
+        concurrency is set on the Ollama server itself, e.g. OLLAMA_NUM_PARALLEL=4.
+        """
+        ChatOllama = _get_provider_class("ollama")
+
+        resolved = _RESOLVED["ollama"]
+        base_url = kwargs.get("base_url") or resolved["base_url"]
 
-        base_url = kwargs.get("base_url") or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        # Runtime knobs (num_ctx, num_thread, ...) default to OLLAMA_* env vars;
+        # explicit kwargs win. Unset knobs are left to the Ollama server.
+        options = {k: resolved[k] for k in _OLLAMA_KNOBS if resolved[k] is not None}
+        options.update({k: kwargs[k] for k in kwargs.keys() - LLMFactory._OLLAMA_EXCLUDE})
 
         return ChatOllama(
             model=model_name or "llama2",
             temperature=temperature,
             base_url=base_url,
-            **{k: v for k, v in kwargs.items() if k != "base_url"}
+            **options
         )
 
     @staticmethod
@@ -286,15 +829,9 @@ class LLMFactory:
         **kwargs
     ) -> BaseChatModel:
         """Create Groq LLM"""
-        try:
-            from langchain_groq import ChatGroq
-        except ImportError:
-            raise ImportError(
-                "langchain-groq is not installed. "
-                "Install it with: pip install langchain-groq"
-            )
+        ChatGroq = _get_provider_class("groq")
 
-        api_key = kwargs.get("api_key") or os.getenv("GROQ_API_KEY")
+        api_key = kwargs.get("api_key") or _RESOLVED["groq"]["api_key"]
         if not api_key:
             raise ValueError("GROQ_API_KEY is required for Groq provider")
 
@@ -302,7 +839,7 @@ class LLMFactory:
             model=model_name or "mixtral-8x7b-32768",
             temperature=temperature,
             groq_api_key=api_key,
-            **{k: v for k, v in kwargs.items() if k != "api_key"}
+            **{k: kwargs[k] for k in kwargs.keys() - LLMFactory._KEY_EXCLUDE}
         )
 
     @staticmethod
@@ -315,10 +852,8 @@ class LLMFactory:
         Create LLM for any OpenAI-compatible API (e.g. Moonshot, 智谱, OpenRouter).
         Requires base_url, api_key, and model (or model_name) in kwargs or env.
         """
-        from langchain_openai import ChatOpenAI
-
-        base_url = kwargs.get("base_url") or os.getenv("OPENAI_COMPATIBLE_BASE_URL")
-        api_key = kwargs.get("api_key") or os.getenv("OPENAI_COMPATIBLE_API_KEY")
+        base_url = kwargs.get("base_url") or _RESOLVED["openai_compatible"]["base_url"]
+        api_key = kwargs.get("api_key") or _RESOLVED["openai_compatible"]["api_key"]
         model = (
             model_name
             or kwargs.get("model")
@@ -340,16 +875,112 @@ class LLMFactory:
                 "model_name (or model) is required for openai_compatible provider"
             )
 
-        passthrough = {k: v for k, v in kwargs.items() if k not in ("base_url", "api_key", "model", "model_name")}
-        return ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            api_key=api_key,
+        return LLMFactory._build_openai_family(
+            "openai_compatible", model, temperature, api_key,
+            kwargs, LLMFactory._COMPATIBLE_EXCLUDE,
             base_url=base_url.rstrip("/"),
-            **passthrough
         )
 
 
+# Module-level entry points, bound once: `from src.utils.llm_factory import create_llm`
+# skips the per-call class attribute / classmethod lookup of LLMFactory.create_llm
+create_llm = LLMFactory.create_llm
+acreate_llm = LLMFactory.acreate_llm
+create_streaming_llm = LLMFactory.create_streaming_llm
+create_resilient_llm = LLMFactory.create_resilient_llm
+create_routed_llm = LLMFactory.create_routed_llm
+create_coalescing_llm = LLMFactory.create_coalescing_llm
+
+# Per-provider factories for apps that use a single provider, e.g.
+# create_deepseek_llm(temperature=0) == LLMFactory.create_llm("deepseek", temperature=0)
+create_deepseek_llm = partial(create_llm, "deepseek")
+create_openai_llm = partial(create_llm, "openai")
+create_anthropic_llm = partial(create_llm, "anthropic")
+create_google_llm = partial(create_llm, "google")
+create_azure_llm = partial(create_llm, "azure")
+create_ollama_llm = partial(create_llm, "ollama")
+create_groq_llm = partial(create_llm, "groq")
+create_openai_compatible_llm = partial(create_llm, "openai_compatible")
+
+
+@lru_cache(maxsize=32)
+def _create_cached(
+    provider: str,
+    model_name: Optional[str],
+    temperature: float,
+    kwargs_key: Tuple[Tuple[str, Any], ...]
+) -> BaseChatModel:
+    """Build (once per distinct configuration) an LLM via the registered creator"""
+    creator = LLMFactory._CREATORS[provider]
+    return creator(model_name, temperature, **dict(kwargs_key))
+
+
+# Ollama options read from OLLAMA_<NAME> env vars; all but keep_alive are integers
+_OLLAMA_KNOBS = ("num_ctx", "num_predict", "num_thread", "num_gpu", "keep_alive")
+
+
+def _env_int(name: str) -> Optional[int]:
+    """Integer env var; a malformed value is ignored (with a warning) so it can't break import"""
+    value = os.getenv(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Ignoring {name}={value!r}: expected an integer")
+        return None
+
+
+def _env_keep_alive() -> Optional[Any]:
+    """OLLAMA_KEEP_ALIVE as seconds ("300", "-1") or a duration string ("10m")"""
+    value = os.getenv("OLLAMA_KEEP_ALIVE")
+    if not value:
+        return None
+    return int(value) if value.lstrip("-").isdigit() else value
+
+
+def _build_resolved() -> Dict[str, Dict[str, Any]]:
+    """Provider credentials / endpoints read from Config and the environment in one pass"""
+    return {
+        "deepseek": {
+            "api_key": Config.DEEPSEEK_API_KEY or os.getenv("DEEPSEEK_API_KEY"),
+            "base_url": Config.DEEPSEEK_BASE_URL,
+        },
+        "openai": {"api_key": Config.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")},
+        "anthropic": {"api_key": os.getenv("ANTHROPIC_API_KEY")},
+        "google": {"api_key": os.getenv("GOOGLE_API_KEY")},
+        "azure": {
+            "api_key": os.getenv("AZURE_OPENAI_API_KEY"),
+            "endpoint": os.getenv("AZURE_OPENAI_ENDPOINT"),
+        },
+        "ollama": {
+            "base_url": os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+            "num_ctx": _env_int("OLLAMA_NUM_CTX"),
+            "num_predict": _env_int("OLLAMA_NUM_PREDICT"),
+            "num_thread": _env_int("OLLAMA_NUM_THREAD"),
+            "num_gpu": _env_int("OLLAMA_NUM_GPU"),
+            "keep_alive": _env_keep_alive(),
+        },
+        "groq": {"api_key": os.getenv("GROQ_API_KEY")},
+        "openai_compatible": {
+            "base_url": os.getenv("OPENAI_COMPATIBLE_BASE_URL"),
+            "api_key": os.getenv("OPENAI_COMPATIBLE_API_KEY"),
+        },
+    }
+
+
+# Resolved once at import; creators read this instead of calling os.getenv
+_RESOLVED = _build_resolved()
+
+
+def refresh_env() -> None:
+    """Re-read provider environment variables (for long-running processes)"""
+    global _RESOLVED
+    _RESOLVED = _build_resolved()
+    # Cached instances were built from the old values
+    LLMFactory.clear_cache()
+
+
 def _register_builtins() -> None:
     """Register all built-in providers so create_llm() resolves by name."""
     LLMFactory.register("deepseek", LLMFactory._create_deepseek)
@@ -361,5 +992,10 @@ def _register_builtins() -> None:
     LLMFactory.register("groq", LLMFactory._create_groq)
     LLMFactory.register("openai_compatible", LLMFactory._create_openai_compatible)
 
+    # Every configured provider must dispatch somewhere; fail at import, not per call
+    missing = LLMFactory.PROVIDER_CONFIGS.keys() - LLMFactory._CREATORS.keys()
+    if missing:
+        raise RuntimeError(f"Providers configured without a creator: {', '.join(sorted(missing))}")
+
 
 _register_builtins()